@@ -3,7 +3,9 @@ admin.py — sqladmin integration for live game management.
 """
 
 from sqladmin import ModelView
-from .models import User, Item, Transaction
+from .models import User, Item, Transaction, TransactionArchive
+from .catalog import catalog
+from .event_log import event_log
 
 
 class UserAdmin(ModelView, model=User):
@@ -25,13 +27,41 @@ class ItemAdmin(ModelView, model=Item):
     name_plural = "Market Items"
     icon = "fa-solid fa-store"
 
+    # Catalog edits made here must reach the cached registry
+    async def after_model_change(self, data, model, is_created, request):
+        if is_created:
+            catalog.invalidate()
+        else:
+            catalog.update_items([model])
+        event_log.append(
+            "update_item", item_id=model.id, price=model.current_price,
+            stock=model.current_stock, is_sold_out=model.is_sold_out,
+        )
+
+    async def after_model_delete(self, model, request):
+        catalog.invalidate()
+
 
 class TransactionAdmin(ModelView, model=Transaction):
     column_list = [
         Transaction.id, Transaction.user_id, Transaction.item_id,
-        Transaction.price_at_purchase, Transaction.timestamp,
+        Transaction.price_at_purchase, Transaction.timestamp, Transaction.round_number,
     ]
     column_sortable_list = [Transaction.timestamp, Transaction.price_at_purchase]
     name = "Transaction"
     name_plural = "Transactions"
     icon = "fa-solid fa-receipt"
+
+
+class TransactionArchiveAdmin(ModelView, model=TransactionArchive):
+    column_list = [
+        TransactionArchive.round_number, TransactionArchive.user_id, TransactionArchive.item_id,
+        TransactionArchive.price_at_purchase, TransactionArchive.timestamp,
+    ]
+    column_sortable_list = [TransactionArchive.round_number, TransactionArchive.timestamp]
+    can_create = False
+    can_edit = False
+    can_delete = False
+    name = "Archived Transaction"
+    name_plural = "Archived Transactions"
+    icon = "fa-solid fa-box-archive"
@@ -0,0 +1,258 @@
+"""
+benchmarks.py — Microbenchmarks for the market hot paths.
+
+Covers:
+  - broadcast fan-out cost vs connection count (fake sockets)
+  - pricing engine: decay, and a full restock+decay tick, over large catalogs
+  - leaderboard payload build + JSON serialization vs user count
+  - ItemResponse validation vs returning pre-serialized bytes
+
+No database or network is touched. Results are written as JSON so runs
+from different commits can be compared:
+
+    python -m app.benchmarks --output bench_before.json
+    python -m app.benchmarks --output bench_after.json --compare bench_before.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from types import SimpleNamespace
+
+from .pricing import price_model, MarketArrays
+from .routes import leaderboard_message
+from .schemas import ItemResponse
+from .websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Stands in for a WebSocket: counts frames, optionally yields to the loop."""
+
+    def __init__(self, yield_on_send: bool = False):
+        self.frames = 0
+        self.yield_on_send = yield_on_send
+
+    async def send_text(self, data: str):
+        self.frames += 1
+        if self.yield_on_send:
+            await asyncio.sleep(0)
+
+
+def _fake_items(n: int) -> list[SimpleNamespace]:
+    rng = random.Random(n)
+    items = []
+    for i in range(n):
+        base = round(rng.uniform(50, 9000), 2)
+        items.append(SimpleNamespace(
+            id=i + 1, name=f"Item {i}", category="General", base_price=base,
+            current_price=round(base * rng.uniform(0.5, 2.5), 2), current_stock=rng.randint(0, 15),
+            is_sold_out=False, image=f"/items/item-{i}.webp",
+            sold_out_timestamp=None, last_purchase_at=None, restock_penalty_multiplier=1.1,
+        ))
+    return items
+
+
+def _fake_users(n: int) -> list[SimpleNamespace]:
+    rng = random.Random(n)
+    users = [
+        SimpleNamespace(
+            username=f"player_{i}", roll_number=f"R{i:05d}",
+            balance=round(rng.uniform(0, 100_000), 2), is_finished=rng.random() < 0.02,
+        )
+        for i in range(n)
+    ]
+    users.sort(key=lambda u: (not u.is_finished, -u.balance))
+    return users
+
+
+def _measure(fn, number: int, repeat: int) -> dict:
+    """Time `fn` (sync) `number` times per round for `repeat` rounds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return _stats(samples)
+
+
+async def _measure_async(fn, number: int, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        samples.append((time.perf_counter() - start) / number)
+    return _stats(samples)
+
+
+def _stats(samples: list[float]) -> dict:
+    return {
+        "mean_us": round(statistics.fmean(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(samples) * 1e6, 3) if len(samples) > 1 else 0.0,
+    }
+
+
+# ── Benchmarks ───────────────────────────────────────────
+
+def bench_broadcast(repeat: int) -> list[dict]:
+    message = {
+        "type": "ITEM_UPDATE", "item_id": 1, "name": "Parle-G Gold (Pack)",
+        "new_price": 102.0, "new_stock": 14, "is_sold_out": False,
+    }
+    results = []
+
+    async def run():
+        for connections in (10, 150, 500, 2000):
+            for yield_on_send in (False, True):
+                mgr = ConnectionManager()
+                mgr.active_connections = [FakeWebSocket(yield_on_send) for _ in range(connections)]
+                stats = await _measure_async(lambda: mgr.broadcast(message), number=10, repeat=repeat)
+                results.append({
+                    "name": "broadcast_fanout",
+                    "params": {"connections": connections, "yield_on_send": yield_on_send},
+                    **stats,
+                })
+
+    asyncio.run(run())
+    return results
+
+
+def bench_pricing(repeat: int) -> list[dict]:
+    results = []
+    now = time.time()
+    for size in (100, 1_000, 10_000, 100_000):
+        items = _fake_items(size)
+        market = MarketArrays.from_items(items)
+        results.append({
+            "name": "price_decay_vectorized",
+            "params": {"items": size},
+            **_measure(lambda: price_model.decay_prices(market.price, market.base), 5, repeat),
+        })
+
+        def tick():
+            m = MarketArrays.from_items(items)
+            m.tick(price_model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+
+        results.append({
+            "name": "market_tick_incl_array_build",
+            "params": {"items": size},
+            **_measure(tick, 3, repeat),
+        })
+    return results
+
+
+def bench_leaderboard(repeat: int) -> list[dict]:
+    results = []
+    for size in (150, 500, 2_000, 10_000):
+        users = _fake_users(size)
+        results.append({
+            "name": "leaderboard_build",
+            "params": {"users": size},
+            **_measure(lambda: leaderboard_message(users), 5, repeat),
+        })
+        results.append({
+            "name": "leaderboard_build_and_serialize",
+            "params": {"users": size},
+            **_measure(lambda: json.dumps(leaderboard_message(users)), 5, repeat),
+        })
+    return results
+
+
+def bench_item_response(repeat: int) -> list[dict]:
+    results = []
+    for size in (80, 1_000):
+        items = _fake_items(size)
+        cached = json.dumps([ItemResponse.model_validate(i).model_dump() for i in items]).encode()
+
+        def validate_and_dump():
+            models = [ItemResponse.model_validate(i) for i in items]
+            return json.dumps([m.model_dump() for m in models]).encode()
+
+        results.append({
+            "name": "item_response_validate",
+            "params": {"items": size},
+            **_measure(validate_and_dump, 5, repeat),
+        })
+        results.append({
+            "name": "item_response_preserialized",
+            "params": {"items": size},
+            **_measure(lambda: bytes(cached), 5, repeat),
+        })
+    return results
+
+
+BENCHMARKS = {
+    "broadcast": bench_broadcast,
+    "pricing": bench_pricing,
+    "leaderboard": bench_leaderboard,
+    "item_response": bench_item_response,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def _key(result: dict) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(current: dict, baseline: dict):
+    """Print mean-time change per benchmark vs a previous JSON report."""
+    old = {_key(r): r for r in baseline["results"]}
+    print(f"\n{'benchmark':<58} {'before µs':>12} {'after µs':>12} {'change':>8}")
+    for r in current["results"]:
+        prev = old.get(_key(r))
+        if not prev:
+            continue
+        change = (r["mean_us"] - prev["mean_us"]) / prev["mean_us"] * 100 if prev["mean_us"] else 0
+        label = f"{r['name']} {json.dumps(r['params'], sort_keys=True)}"
+        print(f"{label:<58} {prev['mean_us']:>12.1f} {r['mean_us']:>12.1f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=list(BENCHMARKS), action="append", help="run a subset")
+    parser.add_argument("--repeat", type=int, default=7, help="timing rounds per benchmark")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous JSON report to diff against")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": [],
+    }
+    for name in args.only or BENCHMARKS:
+        print(f"⏱️  {name}...")
+        report["results"].extend(BENCHMARKS[name](args.repeat))
+
+    for r in report["results"]:
+        print(f"  {r['name']:<34} {json.dumps(r['params']):<46} {r['mean_us']:>12.1f} µs")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+catalog.py — In-memory registry of the marketplace catalog.
+
+The set of items only changes through admin actions, so the ids, names,
+base prices, categories and total count are loaded once at startup and
+kept here. The buy and reset paths read from the registry instead of
+re-querying the items table. Admin edits to existing items call
+update_items(); creating or deleting items calls invalidate().
+
+Also tracks which items each player owns as an int bitset (one bit per
+catalog position), so the "collected everything?" check is O(1).
+"""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import select, values, column, String, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Item, Transaction
+from .seed import SEED_ITEMS
+
+
+class Catalog:
+    """Item ids, names, base prices and categories, keyed by item id."""
+
+    def __init__(self):
+        # Seed data never changes at runtime — build the lookup once
+        self.seed_lookup: dict[str, dict] = {item["name"]: item for item in SEED_ITEMS}
+        self.loaded = False
+        self.item_ids: list[int] = []
+        self.names: dict[int, str] = {}
+        self.base_prices: dict[int, float] = {}
+        self.categories: dict[int, str] = {}
+        self._bit: dict[int, int] = {}
+        self.full_mask = 0
+
+    @property
+    def total_count(self) -> int:
+        return len(self.item_ids)
+
+    async def load(self, db: AsyncSession):
+        """(Re)load the registry from the items table."""
+        result = await db.execute(
+            select(Item.id, Item.name, Item.base_price, Item.category).order_by(Item.id)
+        )
+        rows = result.all()
+        self.item_ids = [row.id for row in rows]
+        self.names = {row.id: row.name for row in rows}
+        self.base_prices = {row.id: row.base_price for row in rows}
+        self.categories = {row.id: row.category for row in rows}
+        self._bit = {item_id: 1 << pos for pos, item_id in enumerate(self.item_ids)}
+        self.full_mask = (1 << len(self.item_ids)) - 1
+        self.loaded = True
+
+    async def ensure(self, db: AsyncSession):
+        """Load the registry if it has been invalidated."""
+        if not self.loaded:
+            await self.load(db)
+
+    def update_items(self, items):
+        """Refresh the cached fields of edited items. Bit positions don't
+        change, so owned-item bitsets stay valid."""
+        if not self.loaded:
+            return
+        for item in items:
+            if item.id not in self._bit:
+                self.invalidate()
+                return
+            self.names[item.id] = item.name
+            self.base_prices[item.id] = item.base_price
+            self.categories[item.id] = item.category
+
+    def invalidate(self):
+        """Called when items are created or deleted. Bit positions may shift,
+        so the owned-item bitsets are dropped too and rebuilt lazily."""
+        self.loaded = False
+        owned_items.clear()
+
+    def seed_table(self):
+        """SEED_ITEMS as an inline VALUES table (name, base_price) for
+        set-based UPDATE ... FROM statements."""
+        return values(
+            column("name", String),
+            column("base_price", Float),
+            name="seed_items",
+        ).data([(item["name"], item["base_price"]) for item in SEED_ITEMS])
+
+    def bit(self, item_id: int) -> int:
+        return self._bit.get(item_id, 0)
+
+    def is_complete(self, bits: int) -> bool:
+        return self.total_count > 0 and bits & self.full_mask == self.full_mask
+
+
+class OwnedItems:
+    """Per-user bitset of distinct items owned this round."""
+
+    def __init__(self):
+        self._bits: dict[uuid.UUID, int] = {}
+
+    async def get(self, db: AsyncSession, user_id: uuid.UUID) -> int:
+        """Return the user's bitset, building it from transactions on first use."""
+        bits = self._bits.get(user_id)
+        if bits is None:
+            result = await db.execute(
+                select(Transaction.item_id)
+                .where(Transaction.user_id == user_id)
+                .distinct()
+            )
+            bits = 0
+            for item_id in result.scalars():
+                bits |= catalog.bit(item_id)
+            self._bits[user_id] = bits
+        return bits
+
+    async def load_all(self, db: AsyncSession):
+        """Build every player's bitset in one query (startup prewarm)."""
+        result = await db.execute(select(Transaction.user_id, Transaction.item_id).distinct())
+        bits: dict[uuid.UUID, int] = {}
+        for user_id, item_id in result.all():
+            bits[user_id] = bits.get(user_id, 0) | catalog.bit(item_id)
+        self._bits = bits
+
+    def add(self, user_id: uuid.UUID, item_id: int):
+        """Record a committed purchase."""
+        if user_id in self._bits:
+            self._bits[user_id] |= catalog.bit(item_id)
+
+    def clear(self, user_id: Optional[uuid.UUID] = None):
+        if user_id is None:
+            self._bits.clear()
+        else:
+            self._bits.pop(user_id, None)
+
+
+# Singletons
+catalog = Catalog()
+owned_items = OwnedItems()
@@ -0,0 +1,57 @@
+"""
+clock.py — The market clock.
+
+RealClock is wall time; VirtualClock runs faster than real time
+(MARKET_CLOCK_SPEED=1000 → 1000×) for tests and simulations. Everything
+that timestamps market activity — the tick scheduler, purchases and the
+cooldown check, admin actions recorded for replay, and price history
+buckets — reads market_clock, so their times line up on either clock.
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class RealClock:
+    """Wall-clock time in epoch seconds."""
+
+    speed = 1.0
+
+    def now(self) -> float:
+        return time.time()
+
+    def utcnow(self) -> datetime:
+        return datetime.fromtimestamp(self.now(), timezone.utc)
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds))
+
+
+class VirtualClock:
+    """Clock that runs `speed` times faster than real time from `start`."""
+
+    def __init__(self, speed: float = 1000.0, start: Optional[float] = None):
+        self.speed = speed
+        self._start = time.time() if start is None else start
+        self._real_start = time.monotonic()
+
+    def now(self) -> float:
+        return self._start + (time.monotonic() - self._real_start) * self.speed
+
+    def utcnow(self) -> datetime:
+        return datetime.fromtimestamp(self.now(), timezone.utc)
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds) / self.speed)
+
+
+def clock_from_env():
+    speed = float(os.getenv("MARKET_CLOCK_SPEED", "1"))
+    return RealClock() if speed == 1 else VirtualClock(speed)
+
+
+# Singleton
+market_clock = clock_from_env()
@@ -0,0 +1,81 @@
+"""
+contention.py — Per-item lock contention profiler.
+
+The buy path times every statement that takes an item's row lock (the
+SELECT ... FOR UPDATE, or the guarded UPDATE in sharded mode) and reports
+here. For the current round we keep, per item: lock acquisitions, how
+many of them actually waited, cumulative and max wait, and the peak
+number of buyers queued on the row at once. Use the report to decide
+which items need more stock, different pricing or sharding.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+
+# Acquisitions faster than this are treated as uncontended
+CONTENTION_WAIT_THRESHOLD = 0.002  # seconds
+
+
+@dataclass
+class ItemContention:
+    acquisitions: int = 0
+    waits: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    waiting: int = 0
+    max_waiters: int = 0
+
+
+class ContentionProfiler:
+    """Lock wait statistics per item id, reset at the start of each round."""
+
+    def __init__(self):
+        self.round_number = 0
+        self.items: dict[int, ItemContention] = {}
+
+    @contextmanager
+    def waiting(self, item_id: int):
+        """Wrap the statement that acquires the item's row lock."""
+        stats = self.items.get(item_id)
+        if stats is None:
+            stats = self.items[item_id] = ItemContention()
+        stats.waiting += 1
+        stats.max_waiters = max(stats.max_waiters, stats.waiting)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            waited = time.perf_counter() - start
+            stats.waiting -= 1
+            stats.acquisitions += 1
+            if waited >= CONTENTION_WAIT_THRESHOLD:
+                stats.waits += 1
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+
+    def reset(self, round_number: int):
+        self.round_number = round_number
+        self.items.clear()
+
+    def report(self, top: int = 20) -> list[dict]:
+        """Hottest items first (by cumulative wait)."""
+        ranked = sorted(self.items.items(), key=lambda kv: kv[1].total_wait, reverse=True)
+        rows = []
+        for item_id, stats in ranked[:top]:
+            row = asdict(stats)
+            rows.append({
+                "item_id": item_id,
+                "acquisitions": row["acquisitions"],
+                "waits": row["waits"],
+                "total_wait_ms": round(row["total_wait"] * 1000, 2),
+                "mean_wait_ms": round(row["total_wait"] / row["waits"] * 1000, 2) if row["waits"] else 0.0,
+                "max_wait_ms": round(row["max_wait"] * 1000, 2),
+                "current_waiters": row["waiting"],
+                "max_concurrent_waiters": row["max_waiters"],
+            })
+        return rows
+
+
+# Singleton
+contention = ContentionProfiler()
@@ -0,0 +1,84 @@
+"""
+drain.py — Graceful drain for shutdown and rolling restarts.
+
+Uvicorn closes every WebSocket with a bare 1012 and only then runs the
+lifespan shutdown, so clients saw the socket die mid-round and all
+reconnected at once. Draining happens first instead (see serve.py):
+
+1. stop admitting buys — /buy answers 503 with Retry-After and
+   /api/health turns 503 so a load balancer takes the node out
+2. wait up to DRAIN_TIMEOUT seconds for in-flight buys, including their
+   commits, event-log appends and broadcasts
+3. stop the market scheduler (a running tick finishes and broadcasts)
+4. send every socket a SERVER_RESTARTING frame with its own jittered
+   reconnect_after_ms, then close it with 1012 (Service Restart)
+
+Stock shards and the owned-item bitsets are write-through (the DB row is
+updated in the same transaction), so there is no write-behind buffer to
+flush; the event log is snapshotted by the lifespan shutdown after this.
+"""
+
+import asyncio
+import os
+import random
+from contextlib import contextmanager
+
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", "10"))
+RECONNECT_MIN_MS = int(os.getenv("DRAIN_RECONNECT_MIN_MS", "1000"))
+RECONNECT_MAX_MS = int(os.getenv("DRAIN_RECONNECT_MAX_MS", "5000"))
+
+
+class Drain:
+    """Admission gate for buys plus a count of the ones in flight."""
+
+    def __init__(self):
+        self.draining = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @contextmanager
+    def track(self):
+        """Count a request as in flight for the duration of the block.
+        Check `draining` before entering; the check and the increment run
+        without an await in between, so no buy slips past the gate."""
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+
+    def begin(self) -> bool:
+        """Close the gate. False if a drain is already under way."""
+        if self.draining:
+            return False
+        self.draining = True
+        return True
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait for in-flight requests; False if some were still running."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    @staticmethod
+    def restart_message() -> dict:
+        """SERVER_RESTARTING frame; the jitter spreads the reconnects out."""
+        return {
+            "type": "SERVER_RESTARTING",
+            "reconnect_after_ms": random.randint(RECONNECT_MIN_MS, RECONNECT_MAX_MS),
+        }
+
+    @staticmethod
+    def retry_after() -> str:
+        """Retry-After header value (seconds) for refused buys."""
+        return str(max(1, round(RECONNECT_MAX_MS / 1000)))
+
+
+# Singleton
+drain = Drain()
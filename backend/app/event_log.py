@@ -0,0 +1,309 @@
+"""
+event_log.py — Append-only market event log with snapshot recovery.
+
+GameState lives only in memory, so a crash mid-round used to lose
+is_active, round_number and winners. Every market mutation is now
+appended here as one JSON line once it has committed:
+
+    buy, tick (restocks + decays), update_item, update_items (bulk),
+    start_game, stop_game, reset_game
+
+The log is folded into a compact MarketState as it is written. Every
+EVENT_SNAPSHOT_EVERY events that state is written out as a snapshot
+(atomically, via rename) and the log is truncated. On startup the latest
+snapshot plus the log tail are replayed to restore GameState.
+
+The database stays the authority for everything it holds. An append can
+fail, or the process can die between a commit and its append, so the log
+may be a little behind: on recovery its item rows are reconciled against
+`items`, and stock shards and owned-item bitsets are loaded from the DB
+(startup.prewarm_caches), never from the log.
+
+File I/O happens on a writer thread, never on the event loop: append()
+folds the event and queues its line, the thread writes whatever has
+queued up in one write + flush (+ one fsync), and snapshots are queued
+the same way so they land between the right events.
+
+The log is off unless EVENT_LOG_PATH is set. It describes one database,
+so give each database its own path — a server pointed at a fresh DB with
+an old log would resume the old round. EVENT_LOG_FSYNC=1 fsyncs every
+batch of appends (slower, but survives power loss, not just a process
+crash).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+from .clock import market_clock
+from .game_state import game_state
+
+EVENT_LOG_PATH = os.getenv("EVENT_LOG_PATH", "")
+EVENT_SNAPSHOT_EVERY = int(os.getenv("EVENT_SNAPSHOT_EVERY", "1000"))
+EVENT_LOG_FSYNC = os.getenv("EVENT_LOG_FSYNC", "0") == "1"
+
+
+class MarketState:
+    """Everything the log needs to rebuild, folded event by event."""
+
+    def __init__(self):
+        self.seq = 0
+        self.is_active = False
+        self.round_number = 0
+        self.winners: list = []
+        self.actions: list = []
+        self.items: dict[int, dict] = {}  # item_id → {price, stock, is_sold_out}
+
+    def _set_item(self, item_id: int, price: float, stock: int, is_sold_out: bool):
+        self.items[item_id] = {"price": price, "stock": stock, "is_sold_out": is_sold_out}
+
+    def apply(self, event: dict):
+        kind = event["type"]
+        if kind == "buy":
+            self._set_item(event["item_id"], event["price"], event["stock"], event["is_sold_out"])
+        elif kind == "tick":
+            for item_id, price, stock, is_sold_out in event["items"]:
+                self._set_item(item_id, price, stock, is_sold_out)
+        elif kind == "update_item":
+            self._set_item(event["item_id"], event["price"], event["stock"], event["is_sold_out"])
+            if self.is_active and event.get("changes"):
+                self.actions.append({"type": "update_item", "at": event["at"],
+                                     "item_id": event["item_id"], **event["changes"]})
+        elif kind == "update_items":
+            for item_id, price, stock, is_sold_out in event["items"]:
+                self._set_item(item_id, price, stock, is_sold_out)
+            if self.is_active:
+                self.actions.extend({"type": "update_item", "at": event["at"], **change}
+                                    for change in event["changes"])
+        elif kind == "start_game":
+            self.is_active = True
+            self.round_number = event["round_number"]
+            self.winners = []
+            self.actions = [{"type": "start_game", "at": event["at"], "items": event["items"]}]
+            for item in event["items"]:
+                self._set_item(item["id"], item["current_price"], item["current_stock"], item["is_sold_out"])
+        elif kind == "stop_game":
+            self.actions.append({"type": "stop_game", "at": event["at"]})
+            self.is_active = False
+            self.winners = event["winners"]
+        elif kind == "reset_game":
+            self.winners = []
+            self.items.clear()
+        self.seq = event["seq"]
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "is_active": self.is_active,
+            "round_number": self.round_number,
+            # Copies: the writer thread serializes this while the loop folds on
+            "winners": list(self.winners),
+            "actions": list(self.actions),
+            "items": dict(self.items),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MarketState":
+        state = cls()
+        state.seq = data["seq"]
+        state.is_active = data["is_active"]
+        state.round_number = data["round_number"]
+        state.winners = data["winners"]
+        state.actions = data["actions"]
+        state.items = {int(item_id): item for item_id, item in data["items"].items()}
+        return state
+
+
+class EventLog:
+    """JSON-lines event log plus a periodic snapshot of the folded state."""
+
+    def __init__(self, path: str, snapshot_every: int, fsync: bool = False):
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot.json"
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.state = MarketState()
+        self.since_snapshot = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._file = None  # writer thread only
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    # ── Writing ──────────────────────────────────────────
+
+    def append(self, kind: str, **data):
+        """Record a committed market mutation."""
+        if not self.enabled:
+            return
+        event = {"seq": self.state.seq + 1, "type": kind, "at": market_clock.now(), **data}
+        self.state.apply(event)
+        self._submit(("event", json.dumps(event, separators=(",", ":")) + "\n"))
+
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """Queue the folded state to be written out, then a fresh log."""
+        self._submit(("snapshot", self.state.to_dict()))
+        self.since_snapshot = 0
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write what is queued and stop the writer thread (blocking)."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _submit(self, task: tuple):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._writer.start()
+        self._queue.put(task)
+
+    # ── Writer thread ────────────────────────────────────
+
+    def _run(self):
+        stop = False
+        while not stop:
+            tasks = [self._queue.get()]
+            # Group commit: everything queued meanwhile goes in the same write
+            while True:
+                try:
+                    tasks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for task in tasks:
+                if task is None:
+                    stop = True
+                elif task[0] == "event":
+                    lines.append(task[1])
+                else:
+                    self._write_lines(lines)
+                    lines = []
+                    self._write_snapshot(task[1])
+            self._write_lines(lines)
+            if stop and self._file is not None:
+                self._file.close()
+                self._file = None
+            for _ in tasks:
+                self._queue.task_done()
+
+    def _write_lines(self, lines: list):
+        if not lines:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("".join(lines))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            print(f"[event_log] Append of {len(lines)} event(s) failed: {e}")
+
+    def _write_snapshot(self, data: dict):
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Events up to data["seq"] are in the snapshot; a crash before this
+            # truncate is harmless because recovery skips them by seq
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, "w", encoding="utf-8")
+        except OSError as e:
+            print(f"[event_log] Snapshot failed: {e}")
+
+    # ── Recovery ─────────────────────────────────────────
+
+    def recover(self) -> MarketState:
+        """Load the latest snapshot and replay the log tail on top of it."""
+        if not self.enabled:
+            return self.state
+        start = time.perf_counter()
+        state = MarketState()
+        source = "empty"
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                state = MarketState.from_dict(json.load(f))
+            source = "snapshot"
+
+        replayed = 0
+        torn = False
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final write from a crash — everything before it is good
+                        print("[event_log] Ignoring truncated event at end of log")
+                        torn = True
+                        break
+                    if event["seq"] > state.seq:
+                        state.apply(event)
+                        replayed += 1
+
+        self.state = state
+        if replayed or torn:
+            # Fold the tail into a fresh snapshot so appends start on a clean log
+            self.snapshot()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"♻️  Event log: restored round {state.round_number} "
+              f"({'active' if state.is_active else 'inactive'}) from {source} + {replayed} events "
+              f"in {elapsed:.1f} ms")
+        return state
+
+    def restore(self):
+        """Push the recovered round state into GameState (the one thing the
+        database doesn't hold)."""
+        state = self.state
+        game_state.is_active = state.is_active
+        game_state.round_number = state.round_number
+        game_state.winners = list(state.winners)
+        game_state.actions = list(state.actions)
+
+    def reconcile(self, items):
+        """Make the folded item rows match the database (Item rows), which
+        wins wherever the log fell behind."""
+        if not self.enabled:
+            return
+        rows = {
+            item.id: {"price": item.current_price, "stock": item.current_stock,
+                      "is_sold_out": item.is_sold_out}
+            for item in items
+        }
+        # Right after a reset the log holds no item rows; nothing to compare
+        behind = sum(
+            1 for item_id, row in rows.items()
+            if self.state.items and self.state.items.get(item_id) != row
+        )
+        self.state.items = rows
+        if behind:
+            print(f"[event_log] {behind} item(s) differed from the database; reconciled to the DB")
+            self.snapshot()
+
+
+def item_row(item) -> list:
+    """Compact [id, price, stock, is_sold_out] entry for tick events."""
+    return [item.id, item.current_price, item.current_stock, item.is_sold_out]
+
+
+# Singleton
+event_log = EventLog(EVENT_LOG_PATH, EVENT_SNAPSHOT_EVERY, EVENT_LOG_FSYNC)
@@ -0,0 +1,141 @@
+"""
+explain_hot_queries.py — Capture EXPLAIN ANALYZE plans for the hot queries
+against a large synthetic dataset.
+
+Everything runs inside one transaction that is rolled back at the end, so
+the seeded players and transactions never reach the real tables.
+
+Run via:  python -m app.explain_hot_queries --users 5000 --txns-per-user 20
+"""
+
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import text
+
+from .database import engine
+
+# name → SQL mirroring the statements issued by routes.py / main.py
+HOT_QUERIES = {
+    "buy_cooldown": """
+        SELECT timestamp FROM transactions
+        WHERE user_id = :user_id
+        ORDER BY timestamp DESC LIMIT 1
+    """,
+    "buy_lock_user": """
+        SELECT * FROM users WHERE id = :user_id FOR UPDATE
+    """,
+    "buy_lock_item": """
+        SELECT * FROM items WHERE id = :item_id FOR UPDATE
+    """,
+    "buy_inventory_cap": """
+        SELECT count(id) FROM transactions
+        WHERE user_id = :user_id AND item_id = :item_id
+    """,
+    "owned_items": """
+        SELECT DISTINCT item_id FROM transactions WHERE user_id = :user_id
+    """,
+    "me_inventory": """
+        SELECT item_id, count(id) FROM transactions
+        WHERE user_id = :user_id GROUP BY item_id
+    """,
+    "leaderboard": """
+        SELECT * FROM users WHERE is_eliminated = false
+        ORDER BY is_finished DESC, balance DESC
+    """,
+    "restock_sweep": """
+        SELECT * FROM items
+        WHERE is_sold_out = true
+          AND sold_out_timestamp IS NOT NULL
+          AND sold_out_timestamp <= now() - interval '15 seconds'
+    """,
+    "decay_sweep": """
+        SELECT * FROM items
+        WHERE is_sold_out = false
+          AND (last_purchase_at IS NULL OR last_purchase_at <= now() - interval '10 seconds')
+    """,
+}
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    """Relations read by a Seq Scan anywhere in a JSON plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def explain_hot_queries(users: int, txns_per_user: int) -> dict:
+    report = {"users": users, "txns_per_user": txns_per_user, "queries": {}}
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            item_ids = (await conn.execute(text("SELECT id FROM items ORDER BY id"))).scalars().all()
+            if not item_ids:
+                raise RuntimeError("No items found in DB. Seed DB first.")
+
+            print(f"🌱 Seeding {users} players × {txns_per_user} transactions (rolled back afterwards)...")
+            await conn.execute(text("""
+                INSERT INTO users (id, username, balance, is_finished, is_eliminated, created_at)
+                SELECT gen_random_uuid(), 'explain_' || g, random() * 100000,
+                       random() < 0.01, random() < 0.2, now()
+                FROM generate_series(1, :users) AS g
+            """), {"users": users})
+            await conn.execute(text("""
+                INSERT INTO transactions (id, user_id, item_id, price_at_purchase, timestamp, round_number)
+                SELECT gen_random_uuid(), u.id,
+                       (CAST(:item_ids AS integer[]))[1 + floor(random() * cardinality(CAST(:item_ids AS integer[])))::int],
+                       random() * 1000, now() - random() * interval '1 hour', 1
+                FROM users u CROSS JOIN generate_series(1, :per_user)
+                WHERE u.username LIKE 'explain\\_%'
+            """), {"item_ids": list(item_ids), "per_user": txns_per_user})
+            await conn.execute(text("ANALYZE users"))
+            await conn.execute(text("ANALYZE transactions"))
+            await conn.execute(text("ANALYZE items"))
+
+            user_id = (await conn.execute(
+                text("SELECT id FROM users WHERE username LIKE 'explain\\_%' LIMIT 1")
+            )).scalar_one()
+            params = {"user_id": user_id, "item_id": item_ids[0]}
+
+            for name, sql in HOT_QUERIES.items():
+                result = await conn.execute(
+                    text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params
+                )
+                raw = result.scalar_one()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+                seq = _seq_scans(plan["Plan"])
+                report["queries"][name] = {
+                    "execution_ms": plan.get("Execution Time"),
+                    "seq_scans": seq,
+                    "plan": plan["Plan"],
+                }
+                # items is tiny; a seq scan there is expected and cheap
+                flag = "⚠️ " if any(rel != "items" for rel in seq) else "✅"
+                print(f"{flag} {name:<20} {plan.get('Execution Time', 0):>9.3f} ms  seq scans: {seq or '-'}")
+        finally:
+            await trans.rollback()
+
+    await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--txns-per-user", type=int, default=20)
+    parser.add_argument("--output", default="explain_report.json", help="where to write the JSON plans")
+    args = parser.parse_args()
+
+    report = asyncio.run(explain_hot_queries(args.users, args.txns_per_user))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"📝 Plans written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+fetch_assets.py — Concurrent, resumable fetcher for catalog images.
+
+Replaces the old one-at-a-time download scripts. Each asset source is
+either a product page (the main image URL is pulled out of its HTML) or a
+direct image URL. Sources are fetched by a bounded pool of workers over
+one keep-alive connection pool:
+
+- failed requests (connection errors, 429, 5xx) are retried with
+  exponential backoff and jitter, honouring Retry-After
+- downloads go to <name>.<ext>.part and resume with a Range request, so
+  an interrupted run picks up where it stopped; the file is renamed into
+  place only once complete
+- assets already on disk are skipped (use --refresh to re-fetch); a
+  re-fetched file identical to the one on disk (same SHA-256) is not
+  rewritten
+- every run writes a JSON report (status, attempts, bytes, hash, error per
+  asset) that the next run reads to know what it already has
+
+    python -m app.fetch_assets                          # built-in sources
+    python -m app.fetch_assets --sources sources.json --concurrency 8
+    python -m app.fetch_assets --refresh --only jbl-go-3-speaker
+
+A sources file is a JSON list of {"name", "url", "kind": "page"|"image"},
+which is also how to point the fetcher at a local stub server.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+REPO_DIR = Path(__file__).resolve().parent.parent.parent
+SAVE_DIR = REPO_DIR / "frontend" / "public" / "items"
+REPORT_PATH = Path(__file__).resolve().parent.parent / "fetch_report.json"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IMAGE_EXTENSIONS = (".jpg", ".png", ".webp")
+MAX_RETRY_AFTER = 30  # seconds
+
+
+@dataclass
+class AssetSource:
+    name: str   # file name without extension
+    url: str
+    kind: str = "page"  # "page" = product page to scrape, "image" = direct image URL
+
+
+# Product pages for catalog items (Amazon.in)
+ASSETS = [
+    AssetSource("jbl-go-3-speaker",         "https://www.amazon.in/JBL-Wireless-Portable-Bluetooth-Waterproof/dp/B08FB396L1"),
+    AssetSource("noise-smartwatch",         "https://www.amazon.in/Noise-Launched-Bluetooth-Detection-Smartwatch/dp/B0CQRQK8L8"),
+    AssetSource("sony-wired-headphones",    "https://www.amazon.in/Sony-MDR-ZX310AP-Headband-Stereo-Headset/dp/B0784BMDRW"),
+    AssetSource("tp-link-wifi-router",      "https://www.amazon.in/TP-Link-Archer-C6-Wireless-MU-MIMO/dp/B07GVR9TG7"),
+    AssetSource("laptop-cooling-pad",       "https://www.amazon.in/Ant-Esports-Gaming-Notebook-Cooler/dp/B0D9W55VLG"),
+    AssetSource("gaming-keyboard-membrane", "https://www.amazon.in/Ant-Esports-MK801-V2-Mechanical/dp/B0DX1MF624"),
+    AssetSource("extension-board-4-socket", "https://www.amazon.in/GM-Modular-3060-Book-Multicolour/dp/B008XT42JU"),
+    AssetSource("echo-dot-alexa",           "https://www.amazon.in/Echo-Dot-5th-Gen-Alexa-smart-speaker/dp/B09B8XJDW5"),
+    AssetSource("samsung-galaxy-buds",      "https://www.amazon.in/Samsung-Enabled-Enriched-Battery-Controls/dp/B0FDGVNSLH"),
+    AssetSource("cotton-handkerchiefs-3pc", "https://www.amazon.in/Kuber-Industries-Premium-Collection-Handkerchiefs/dp/B092DP7TJC"),
+    AssetSource("sports-socks-pack-of-3",   "https://www.amazon.in/BADOWL-POWERSTEP-Cushioned-Athletic-Breathable/dp/B0GG48P82L"),
+    AssetSource("printed-t-shirt",          "https://www.amazon.in/boffi-Oversized-T-Shirt-Shoulder-Regular/dp/B0DVKTGDXJ"),
+    AssetSource("polo-t-shirt",             "https://www.amazon.in/KAJARU-Waffle-T-Shirt-Sleeve-Collar/dp/B0FFMVD46C"),
+    AssetSource("cotton-kurta-daily",       "https://www.amazon.in/Amazon-Brand-Symbol-Regular-SYMETHLKUR-1_White_L/dp/B0F7XP4BQJ"),
+    AssetSource("denim-jeans-regular",      "https://www.amazon.in/CHEMISTREE-Bootcut-Bell-Bottom-Durable-Stretch/dp/B0G2C8PX4X"),
+    AssetSource("joggers-trackpants",       "https://www.amazon.in/Dollar-Cotton-Trackpant-Charcoal-Melange/dp/B0D1YQ4BXT"),
+    AssetSource("formal-shirt",             "https://www.amazon.in/Pinkmint-Sleeve-Button-Collared-Casual/dp/B0CW1YFRPY"),
+    AssetSource("ethnic-dupatta",           "https://www.amazon.in/AKSHADEEP-Bandhani-Patola-Print-Dupattas/dp/B0CQLKG6Y7"),
+    AssetSource("winter-beanie",            "https://www.amazon.in/NORTHWIND-Winter-winter-beanie-woolen/dp/B0CL9J3FFL"),
+    AssetSource("ray-ban-aviators",         "https://www.amazon.in/Ray-Ban-protected-Sunglasses-0RB3129IW022658-millimeters/dp/B00JZ48QT4"),
+    AssetSource("titan-watch-classic",      "https://www.amazon.in/Titan-Analog-Gray-Dial-Watch-18062617NM01/dp/B09P1NS52N"),
+    AssetSource("silk-saree-mysore",        "https://www.amazon.in/Shree-Silk-Mills-Lightweight-Designer/dp/B0GDM4BDYS"),
+    AssetSource("leather-jacket-faux",      "https://www.amazon.in/STYLING-Leather-Jackets-Motorcycle-Asymmetric/dp/B0FNNBD9FX"),
+    AssetSource("scented-candle-glass",     "https://www.amazon.in/SEVA-HOME-Heirloom-Scented-Candle/dp/B0CTH955XH"),
+    AssetSource("bamboo-plant-lucky",       "https://www.amazon.in/Nurturing-Birthday-Gifting-Housewarming-Friendly/dp/B0CJG1851P"),
+    AssetSource("swiss-knife-victorinox",   "https://www.amazon.in/Victorinox-Huntsman-Swiss-Knife-1-3713/dp/B0001P151W"),
+    AssetSource("yoga-mat-premium",         "https://www.amazon.in/Overcmr-Premium-Non-Slip-Textured-Exercise/dp/B0GBNSMYBF"),
+    AssetSource("silver-coin-10g",          "https://www.amazon.in/ijuels-Hallmarked-Certified-Swastik-Embossed/dp/B07FZ2SQFQ"),
+    AssetSource("crystal-vase-small",       "https://www.amazon.in/Interior-Handicraft-Hammered-Vintage-Antique/dp/B0B77Y1N8M"),
+    AssetSource("swarovski-pendant",        "https://www.amazon.in/Swarovski-Constella-pendant-Gold-tone-plated/dp/B0B1JPSJLH"),
+]
+
+# Tried in order: hi-res, large, main, landing, then any product image
+IMAGE_URL_PATTERNS = [
+    re.compile(r'"hiRes"\s*:\s*"(https://m\.media-amazon\.com/images/I/[^"]+)"'),
+    re.compile(r'"large"\s*:\s*"(https://m\.media-amazon\.com/images/I/[^"]+)"'),
+    re.compile(r'"mainUrl"\s*:\s*"(https://m\.media-amazon\.com/images/I/[^"]+)"'),
+    re.compile(r'"landingImageUrl"\s*:\s*"(https://m\.media-amazon\.com/images/I/[^"]+)"'),
+    re.compile(r'(https://m\.media-amazon\.com/images/I/[A-Za-z0-9+_.-]+\.(?:jpg|png|webp))'),
+]
+# Anything that looks like an image URL — for non-Amazon (e.g. stub) pages
+GENERIC_IMAGE_URL = re.compile(r'(https?://[^"\'\s<>]+\.(?:jpg|png|webp))')
+
+
+def extract_image_url(html: str) -> Optional[str]:
+    """Main product image URL from product page HTML."""
+    for pattern in IMAGE_URL_PATTERNS + [GENERIC_IMAGE_URL]:
+        match = pattern.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+
+def image_extension(url: str) -> str:
+    path = url.split("?")[0].lower()
+    return next((ext for ext in IMAGE_EXTENSIONS if path.endswith(ext)), ".jpg")
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class FetchResult:
+    name: str
+    url: str
+    status: str = "failed"  # downloaded | unchanged | present | failed
+    image_url: Optional[str] = None
+    path: Optional[str] = None
+    sha256: Optional[str] = None
+    bytes: int = 0
+    attempts: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class RetryableError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AssetFetcher:
+    """Fetches AssetSources into `save_dir` with a shared HTTP client."""
+
+    def __init__(self, client: httpx.AsyncClient, save_dir: Path, retries: int = 4,
+                 backoff: float = 0.5, refresh: bool = False, known: dict = None):
+        self.client = client
+        self.save_dir = save_dir
+        self.retries = retries
+        self.backoff = backoff
+        self.refresh = refresh
+        self.known = known or {}  # name → result dict from the previous report
+
+    # ── Retries ──────────────────────────────────────────
+
+    def _delay(self, attempt: int, error: Exception) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, MAX_RETRY_AFTER)
+        return self.backoff * 2 ** (attempt - 1) * (0.5 + random.random())
+
+    @staticmethod
+    def _check(resp: httpx.Response):
+        if resp.status_code in RETRY_STATUSES:
+            retry_after = resp.headers.get("retry-after")
+            raise RetryableError(
+                f"HTTP {resp.status_code}",
+                float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        resp.raise_for_status()
+
+    async def _with_retries(self, result: FetchResult, call):
+        for attempt in range(1, self.retries + 2):
+            result.attempts += 1
+            try:
+                return await call()
+            except (httpx.TransportError, RetryableError) as e:
+                if attempt > self.retries:
+                    raise
+                await asyncio.sleep(self._delay(attempt, e))
+
+    # ── Fetching ─────────────────────────────────────────
+
+    def _existing(self, name: str) -> Optional[Path]:
+        for ext in IMAGE_EXTENSIONS:
+            path = self.save_dir / f"{name}{ext}"
+            if path.is_file():
+                return path
+        return None
+
+    async def _get_text(self, url: str) -> str:
+        resp = await self.client.get(url)
+        self._check(resp)
+        return resp.text
+
+    async def _download(self, url: str, part: Path):
+        """Stream `url` into `part`, resuming from whatever is already there."""
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self.client.stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 416 and offset:
+                return  # the partial file is already complete
+            self._check(resp)
+            mode = "ab" if resp.status_code == 206 else "wb"
+            with open(part, mode) as f:
+                async for chunk in resp.aiter_bytes():
+                    f.write(chunk)
+
+    async def fetch(self, source: AssetSource) -> FetchResult:
+        result = FetchResult(name=source.name, url=source.url)
+        started = time.perf_counter()
+        try:
+            existing = self._existing(source.name)
+            if existing and not self.refresh:
+                known = self.known.get(source.name, {})
+                result.status = "present"
+                result.path = str(existing)
+                result.bytes = existing.stat().st_size
+                result.image_url = known.get("image_url")
+                result.sha256 = sha256_file(existing)
+                return result
+
+            if source.kind == "page":
+                html = await self._with_retries(result, lambda: self._get_text(source.url))
+                result.image_url = extract_image_url(html)
+                if not result.image_url:
+                    raise ValueError("no product image URL found in page HTML")
+            else:
+                result.image_url = source.url
+
+            target = self.save_dir / f"{source.name}{image_extension(result.image_url)}"
+            part = target.with_name(target.name + ".part")
+            await self._with_retries(result, lambda: self._download(result.image_url, part))
+
+            result.sha256 = sha256_file(part)
+            result.bytes = part.stat().st_size
+            result.path = str(target)
+            if target.is_file() and sha256_file(target) == result.sha256:
+                part.unlink()
+                result.status = "unchanged"
+            else:
+                os.replace(part, target)
+                result.status = "downloaded"
+        except Exception as e:
+            result.status = "failed"
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            result.seconds = round(time.perf_counter() - started, 3)
+        return result
+
+    async def run(self, sources: list[AssetSource], concurrency: int) -> list[FetchResult]:
+        """Fetch every source with at most `concurrency` in flight."""
+        queue: asyncio.Queue = asyncio.Queue()
+        for source in sources:
+            queue.put_nowait(source)
+        results: list[FetchResult] = []
+
+        async def worker():
+            while True:
+                try:
+                    source = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await self.fetch(source)
+                results.append(result)
+                icon = {"downloaded": "✅", "unchanged": "⚡", "present": "⚡"}.get(result.status, "❌")
+                print(f"  {icon} {result.name}: {result.status}"
+                      + (f" ({result.error})" if result.error else ""))
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        order = {source.name: i for i, source in enumerate(sources)}
+        return sorted(results, key=lambda r: order[r.name])
+
+
+def load_report(path: Path) -> dict:
+    """Previous run's results keyed by asset name (empty if none)."""
+    if not path.is_file():
+        return {}
+    return {r["name"]: r for r in json.loads(path.read_text())["results"]}
+
+
+async def fetch_assets(sources: list[AssetSource], save_dir: Path, report_path: Path,
+                       concurrency: int = 6, retries: int = 4, backoff: float = 0.5,
+                       refresh: bool = False, timeout: float = 15) -> dict:
+    save_dir.mkdir(parents=True, exist_ok=True)
+    started = datetime.now(timezone.utc)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=timeout,
+                                 follow_redirects=True) as client:
+        fetcher = AssetFetcher(client, save_dir, retries=retries, backoff=backoff,
+                               refresh=refresh, known=load_report(report_path))
+        results = await fetcher.run(sources, concurrency)
+
+    finished = datetime.now(timezone.utc)
+    report = {
+        "started_at": started.isoformat(),
+        "finished_at": finished.isoformat(),
+        "duration_s": round((finished - started).total_seconds(), 3),
+        "summary": dict(Counter(r.status for r in results)),
+        "results": [asdict(r) for r in results],
+    }
+    report_path.write_text(json.dumps(report, indent=2))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=Path, help="JSON list of {name, url, kind} (default: built-in list)")
+    parser.add_argument("--only", action="append", help="fetch just these asset names")
+    parser.add_argument("--save-dir", type=Path, default=SAVE_DIR)
+    parser.add_argument("--report", type=Path, default=REPORT_PATH)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--backoff", type=float, default=0.5, help="base retry delay in seconds")
+    parser.add_argument("--timeout", type=float, default=15)
+    parser.add_argument("--refresh", action="store_true", help="re-fetch assets already on disk")
+    args = parser.parse_args()
+
+    sources = ASSETS
+    if args.sources:
+        sources = [AssetSource(**entry) for entry in json.loads(args.sources.read_text())]
+    if args.only:
+        sources = [s for s in sources if s.name in args.only]
+
+    print(f"📦 Fetching {len(sources)} assets with {args.concurrency} workers...")
+    report = asyncio.run(fetch_assets(
+        sources, args.save_dir, args.report, concurrency=args.concurrency, retries=args.retries,
+        backoff=args.backoff, refresh=args.refresh, timeout=args.timeout,
+    ))
+    print(f"\n{report['summary']} in {report['duration_s']}s")
+    print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 """
 game_state.py — In-memory singleton tracking the current game session.
 
-Resets on server restart (intentional — this is an event game).
+Lives only in memory: a restart resets it to "no active round" unless
+EVENT_LOG_PATH is set, in which case it is restored from the market
+event log (see event_log.py).
 """
 
+from .clock import market_clock
+
 
 class GameState:
     """Tracks whether the game is active and the current round."""
@@ -12,11 +16,17 @@ class GameState:
         self.is_active: bool = False
         self.round_number: int = 0
         self.winners: list = []  # top 3 dicts: { username, roll_number, balance, rank }
+        self.actions: list = []  # admin actions this round, for replay (see simulate.py)
 
     def start(self):
         self.is_active = True
         self.round_number += 1
         self.winners = []
+        self.actions = []
+
+    def record_action(self, kind: str, **data):
+        """Note an admin action that changes the market during this round."""
+        self.actions.append({"type": kind, "at": market_clock.now(), **data})
 
     def stop(self, winners: list):
         self.is_active = False
@@ -0,0 +1,312 @@
+"""
+loadtest.py — Simulate hundreds of concurrent players against the game.
+
+Each simulated player registers, holds a /ws connection (keeping its own
+view of the market from ITEM_UPDATE frames) and buys with one of a few
+strategies, honouring the server's cooldown replies. At the end it prints
+and writes a JSON report: throughput, /buy latency percentiles, broadcast
+delivery lag and an error breakdown.
+
+Against a running server (HTTP + sockets):
+    python -m app.loadtest --players 500 --duration 120 --base-url http://localhost:8000 \\
+        --admin-password '...' --start-game
+
+In-process via ASGITransport (HTTP only, no sockets; DB must be seeded):
+    python -m app.loadtest --players 150 --duration 60 --in-process
+
+Broadcast lag is measured from the moment a buy request is sent to the
+moment the matching ITEM_UPDATE (same item, same resulting price and
+stock) first arrives on each socket, so it includes the purchase itself.
+Frames that match no pending buy (restock, decay, admin edits) are not
+sampled.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import Counter
+
+import httpx
+import websockets
+
+STRATEGIES = ("cheapest", "random", "collector")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def classify_error(status: int, detail: str) -> str:
+    """Map a failed /buy reply to an outcome bucket."""
+    detail = detail or ""
+    if "Cooldown" in detail:
+        return "cooldown"
+    if "SOLD OUT" in detail or "out of stock" in detail:
+        return "sold_out"
+    if "Insufficient balance" in detail:
+        return "insufficient_balance"
+    if "Max is 2" in detail:
+        return "inventory_cap"
+    if "not active" in detail:
+        return "game_inactive"
+    return f"http_{status}"
+
+
+class Stats:
+    """Shared counters for the whole run."""
+
+    def __init__(self):
+        self.buy_latencies: list[float] = []
+        self.broadcast_lags: list[float] = []
+        self.outcomes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.frames_received = 0
+        self.sockets_open = 0
+        # Buy frames are keyed (item_id, new_price, new_stock). The server
+        # broadcasts before it answers the buyer, so a frame can arrive
+        # before its buy is known: those receipts wait in `early`.
+        self.pending_broadcasts: dict[tuple, list] = {}  # key → [sent, sockets left]
+        self.early_frames: dict[tuple, list[float]] = {}  # key → receipt times
+        self._last_prune = 0.0
+
+    def frame_received(self, key: tuple, now: float):
+        """One socket's receipt of an ITEM_UPDATE."""
+        pending = self.pending_broadcasts.get(key)
+        if pending is None:
+            self.early_frames.setdefault(key, []).append(now)
+            return
+        self.broadcast_lags.append(now - pending[0])
+        pending[1] -= 1
+        if pending[1] <= 0:
+            del self.pending_broadcasts[key]
+
+    def buy_completed(self, key: tuple, sent: float):
+        """A successful buy: sample receipts that beat the response, then
+        wait for the remaining sockets open right now."""
+        now = time.perf_counter()
+        received = [t for t in self.early_frames.pop(key, ()) if t >= sent]
+        self.broadcast_lags.extend(t - sent for t in received)
+        remaining = self.sockets_open - len(received)
+        if remaining > 0:
+            self.pending_broadcasts[key] = [sent, remaining]
+        if now - self._last_prune > 1:
+            self._prune(now)
+
+    def _prune(self, now: float, max_age: float = 30):
+        """Drop frames that never matched a buy (restock, decay, admin
+        edits) and buys whose sockets went away."""
+        self._last_prune = now
+        self.early_frames = {k: v for k, v in self.early_frames.items() if now - v[-1] < max_age}
+        self.pending_broadcasts = {k: v for k, v in self.pending_broadcasts.items() if now - v[0] < max_age}
+
+    def summary(self, players: int, elapsed: float) -> dict:
+        ok = self.outcomes.get("success", 0)
+        return {
+            "players": players,
+            "duration_s": round(elapsed, 2),
+            "buy_requests": len(self.buy_latencies),
+            "buy_success": ok,
+            "throughput_buys_per_s": round(ok / elapsed, 2) if elapsed else 0,
+            "throughput_requests_per_s": round(len(self.buy_latencies) / elapsed, 2) if elapsed else 0,
+            "buy_latency_ms": {
+                f"p{p}": round(percentile(self.buy_latencies, p) * 1000, 2) for p in (50, 95, 99)
+            },
+            "broadcast_lag_ms": {
+                f"p{p}": round(percentile(self.broadcast_lags, p) * 1000, 2) for p in (50, 95, 99)
+            },
+            "broadcast_frames": self.frames_received,
+            "outcomes": dict(self.outcomes),
+            "errors": dict(self.errors),
+        }
+
+
+class Player:
+    """One simulated player: registration, socket listener and buy loop."""
+
+    def __init__(self, idx: int, run_id: str, strategy: str, client: httpx.AsyncClient,
+                 ws_url: str | None, stats: Stats, think_time: float):
+        self.username = f"lt_{run_id}_{idx}"
+        self.strategy = strategy
+        self.client = client
+        self.ws_url = ws_url
+        self.stats = stats
+        self.think_time = think_time
+        self.user_id: str | None = None
+        self.balance = 0.0
+        self.owned: Counter = Counter()
+        self.market: dict[int, dict] = {}
+
+    async def register(self):
+        resp = await self.client.post("/api/register", json={"username": self.username})
+        resp.raise_for_status()
+        data = resp.json()
+        self.user_id = data["id"]
+        self.balance = data["balance"]
+
+    async def listen(self, stop: asyncio.Event):
+        """Hold a socket open, keep the market view fresh and measure lag."""
+        try:
+            async with websockets.connect(self.ws_url, max_queue=None) as ws:
+                self.stats.sockets_open += 1
+                try:
+                    while not stop.is_set():
+                        try:
+                            raw = await asyncio.wait_for(ws.recv(), timeout=1)
+                        except asyncio.TimeoutError:
+                            continue
+                        now = time.perf_counter()
+                        self.stats.frames_received += 1
+                        msg = json.loads(raw)
+                        if msg.get("type") == "ITEM_UPDATE":
+                            item = self.market.setdefault(msg["item_id"], {"id": msg["item_id"]})
+                            item.update(
+                                current_price=msg["new_price"],
+                                current_stock=msg["new_stock"],
+                                is_sold_out=msg["is_sold_out"],
+                            )
+                            self.stats.frame_received((msg["item_id"], msg["new_price"], msg["new_stock"]), now)
+                finally:
+                    self.stats.sockets_open -= 1
+        except Exception as e:
+            self.stats.errors[f"ws_{type(e).__name__}"] += 1
+
+    def pick_item(self) -> dict | None:
+        candidates = [
+            i for i in self.market.values()
+            if not i.get("is_sold_out") and i.get("current_price", 0) <= self.balance
+            and self.owned[i["id"]] < 2
+        ]
+        if not candidates:
+            return None
+        if self.strategy == "cheapest":
+            return min(candidates, key=lambda i: i["current_price"])
+        if self.strategy == "collector":
+            missing = [i for i in candidates if self.owned[i["id"]] == 0]
+            return random.choice(missing or candidates)
+        return random.choice(candidates)
+
+    async def buy_loop(self, stop: asyncio.Event):
+        while not stop.is_set():
+            item = self.pick_item()
+            if item is None:
+                await asyncio.sleep(self.think_time)
+                continue
+
+            sent = time.perf_counter()
+            try:
+                resp = await self.client.post(
+                    "/api/buy", json={"user_id": self.user_id, "item_id": item["id"]}
+                )
+            except Exception as e:
+                self.stats.errors[f"http_{type(e).__name__}"] += 1
+                await asyncio.sleep(self.think_time)
+                continue
+            self.stats.buy_latencies.append(time.perf_counter() - sent)
+
+            wait = self.think_time
+            if resp.status_code == 200:
+                data = resp.json()
+                self.stats.outcomes["success"] += 1
+                self.balance = data["new_balance"]
+                self.owned[item["id"]] += 1
+                bought = data["item"]
+                if self.ws_url:
+                    self.stats.buy_completed((bought["id"], bought["current_price"], bought["current_stock"]), sent)
+                self.market[bought["id"]].update(bought)
+                if data.get("is_finished"):
+                    return
+            else:
+                detail = resp.json().get("detail", "") if resp.headers.get("content-type", "").startswith("application/json") else ""
+                outcome = classify_error(resp.status_code, detail)
+                self.stats.outcomes[outcome] += 1
+                match = re.search(r"wait (\d+) seconds", detail)
+                if match:
+                    wait = int(match.group(1)) + random.random()
+
+            await asyncio.sleep(wait * (0.5 + random.random()))
+
+
+async def run(args) -> dict:
+    run_id = uuid.uuid4().hex[:6]
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+
+    if args.in_process:
+        from .main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30)
+        ws_url = None
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30)
+        ws_url = re.sub(r"^http", "ws", args.base_url.rstrip("/")) + "/ws"
+
+    async with client:
+        if args.start_game:
+            await client.post("/api/admin/login", json={"password": args.admin_password})
+            await client.post("/api/admin/start-game")
+
+        items = (await client.get("/api/items")).json()
+        players = [
+            Player(i, run_id, STRATEGIES[i % len(STRATEGIES)], client, ws_url, stats, args.think_time)
+            for i in range(args.players)
+        ]
+        for p in players:
+            p.market = {item["id"]: dict(item) for item in items}
+
+        print(f"👥 Registering {args.players} players...")
+        await asyncio.gather(*(p.register() for p in players))
+
+        stop = asyncio.Event()
+        tasks = []
+        if ws_url:
+            tasks += [asyncio.create_task(p.listen(stop)) for p in players]
+            await asyncio.sleep(1)  # let sockets connect before buying
+            print(f"🔌 {stats.sockets_open} sockets open")
+
+        print(f"🛒 Buying for {args.duration}s...")
+        started = time.perf_counter()
+        tasks += [asyncio.create_task(p.buy_loop(stop)) for p in players]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if args.in_process and args.traces_output:
+        from .tracing import tracer
+        count = tracer.dump_jsonl(args.traces_output)
+        print(f"🧵 {count} traces written to {args.traces_output}")
+
+    return stats.summary(args.players, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=150)
+    parser.add_argument("--duration", type=float, default=60, help="seconds of buying")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="drive the app via ASGITransport (no sockets)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean pause between buy attempts")
+    parser.add_argument("--max-connections", type=int, default=200, help="HTTP connection pool size")
+    parser.add_argument("--admin-password", default="")
+    parser.add_argument("--start-game", action="store_true", help="log in as admin and start a round first")
+    parser.add_argument("--output", default="loadtest_report.json")
+    parser.add_argument("--traces-output", help="with --in-process: dump sampled /buy traces (JSON lines)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
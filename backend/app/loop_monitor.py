@@ -0,0 +1,105 @@
+"""
+loop_monitor.py — Event-loop lag monitor and slow-callback detector.
+
+Everything (HTTP handlers, sockets, background loops) shares one asyncio
+loop, so any synchronous stretch of work stalls all of it. The monitor has
+two halves:
+
+- a heartbeat task on the loop that wakes every LOOP_MONITOR_INTERVAL and
+  records how late it woke (event-loop lag histogram);
+- a watchdog thread that notices when the heartbeat has gone quiet for
+  longer than LOOP_SLOW_THRESHOLD and grabs the loop thread's stack at
+  that moment — i.e. the code that is blocking it.
+
+Stalls are printed with their stack, counted in metrics and kept in a
+small buffer for GET /api/admin/slow-callbacks.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from .metrics import LOOP_LAG, SLOW_CALLBACKS
+
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1"))   # seconds between heartbeats
+LOOP_SLOW_THRESHOLD = float(os.getenv("LOOP_SLOW_THRESHOLD", "0.25"))      # stall length worth reporting
+
+
+class LoopMonitor:
+    """Heartbeat task + watchdog thread for the running event loop."""
+
+    def __init__(self, interval: float, threshold: float, keep: int = 50):
+        self.interval = interval
+        self.threshold = threshold
+        self.reports: deque[dict] = deque(maxlen=keep)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._current_report: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start monitoring the running loop (call from inside it)."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - start - self.interval)
+            LOOP_LAG.observe(lag)
+            self._last_beat = now
+
+            report = self._current_report
+            if report is not None:
+                # The stall the watchdog caught is over — record its full length
+                self._current_report = None
+                report["total_ms"] = round(lag * 1000, 1)
+                print(f"[loop_monitor] Loop unblocked after {report['total_ms']} ms")
+
+    def _watchdog(self):
+        while not self._stop.wait(self.interval / 2):
+            blocked_for = time.monotonic() - self._last_beat - self.interval
+            if blocked_for < self.threshold or self._current_report is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.format_stack(frame) if frame else []
+            report = {
+                "detected_at": datetime.now(timezone.utc).isoformat(),
+                "blocked_for_ms": round(blocked_for * 1000, 1),
+                "total_ms": None,
+                "stack": "".join(stack),
+            }
+            self._current_report = report
+            self.reports.append(report)
+            SLOW_CALLBACKS.inc()
+            print(
+                f"[loop_monitor] Event loop blocked for {report['blocked_for_ms']} ms "
+                f"(threshold {self.threshold * 1000:.0f} ms). Loop thread stack:\n{report['stack']}"
+            )
+
+    def recent(self) -> list[dict]:
+        return list(self.reports)
+
+
+# Singleton
+loop_monitor = LoopMonitor(LOOP_MONITOR_INTERVAL, LOOP_SLOW_THRESHOLD)
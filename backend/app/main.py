@@ -3,158 +3,129 @@ main.py — FastAPI application entry point.
 
 - Mounts routes and sqladmin
 - WebSocket endpoint for real-time price/stock broadcasts
-- Background tasks: restock loop + price decay (only when game active)
+- Background tasks: market tick scheduler (restock + price decay, only when game active)
+- Graceful drain on shutdown (drain.py, run via serve.py)
 - Admin endpoints for game session lifecycle
 """
 
 import asyncio
-from datetime import datetime, timezone, timedelta
+import time
 from contextlib import asynccontextmanager
+from typing import Literal
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pathlib import Path
-from sqlalchemy import select, update
+from sqlalchemy import (
+    select, update, insert, delete, func, case, text, bindparam, cast, and_, or_, true, Float, Numeric,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqladmin import Admin
 
-from .database import engine, async_session, Base
-from .models import Item, User, Transaction
+from .database import engine, async_session, IS_SQLITE, write_lock
+from .models import Item, User, Transaction, TransactionArchive
 from .routes import router
 from .websocket_manager import manager
-from .admin import UserAdmin, ItemAdmin, TransactionAdmin
-from .seed import seed as seed_db, SEED_ITEMS
+from .admin import UserAdmin, ItemAdmin, TransactionAdmin, TransactionArchiveAdmin
+from .seed import SEED_ITEMS
+from .startup import StartupPhases, prepare_database, prewarm_pool, prewarm_caches
 from .game_state import game_state
+from .stock_shards import stock_shards
+from .catalog import catalog
+from .metrics import registry as metrics_registry
+from .loop_monitor import loop_monitor
+from .contention import contention
+from .scheduler import MarketScheduler
+from .clock import market_clock
+from .simulate import export_round, item_state
+from .event_log import event_log, item_row
+from .static_assets import static_assets
+from .tracing import tracer
+from .drain import drain, DRAIN_TIMEOUT
+from .price_history import price_history
+from .round_export import EXPORT_FORMATS, export_transactions, export_standings
 from .schemas import (
-    AdminItemUpdate, ItemResponse, GameStateResponse, WinnerEntry,
+    AdminItemUpdate, AdminBulkItemUpdate, ItemResponse, GameStateResponse, WinnerEntry,
 )
 
+ExportFormat = Literal["ndjson", "csv"]
+
 # ── Constants ────────────────────────────────────────────
-RESTOCK_CHECK_INTERVAL = 2        # seconds between restock checks
+MARKET_TICK_INTERVAL = 1          # seconds between market ticks (restock checks)
 RESTOCK_DELAY = 15                # seconds before sold-out items restock
-DECAY_CHECK_INTERVAL = 5          # seconds between decay sweeps
+DECAY_CHECK_INTERVAL = 5          # seconds between decay sweeps (every Nth tick)
 DECAY_INACTIVITY_THRESHOLD = 10   # seconds of no purchases before decay
-DECAY_PERCENTAGE = 0.02           # 2% price decay per tick
-MIN_PRICE_FACTOR = 0.5            # price floor = base_price * 0.5
 DEFAULT_BALANCE = 100_000.00      # starting balance for users
 DEFAULT_STOCK = 15                # starting stock for items
 PURCHASE_COOLDOWN = 30            # seconds between purchases for a user
 
 
-# ── Background Tasks ────────────────────────────────────
-
-async def restock_loop():
-    """Check for sold-out items and restock after RESTOCK_DELAY seconds."""
-    while True:
-        try:
-            if game_state.is_active:
-                async with async_session() as db:
-                    now = datetime.now(timezone.utc)
-                    cutoff = now - timedelta(seconds=RESTOCK_DELAY)
-
-                    result = await db.execute(
-                        select(Item)
-                        .where(Item.is_sold_out == True)
-                        .where(Item.sold_out_timestamp != None)
-                        .where(Item.sold_out_timestamp <= cutoff)
-                    )
-                    items_to_restock = result.scalars().all()
-
-                    for item in items_to_restock:
-                        item.current_stock = DEFAULT_STOCK
-                        item.is_sold_out = False
-                        item.sold_out_timestamp = None
-                        # Price hike penalty on restock
-                        item.current_price = round(
-                            item.current_price * item.restock_penalty_multiplier, 2
-                        )
-
-                        await manager.broadcast({
-                            "type": "ITEM_UPDATE",
-                            "item_id": item.id,
-                            "name": item.name,
-                            "new_price": item.current_price,
-                            "new_stock": item.current_stock,
-                            "is_sold_out": False,
-                        })
-
-                    if items_to_restock:
-                        await db.commit()
-
-        except Exception as e:
-            print(f"[restock_loop] Error: {e}")
-
-        await asyncio.sleep(RESTOCK_CHECK_INTERVAL)
-
-
-async def price_decay_loop():
-    """Lower prices of items that haven't been purchased recently."""
-    while True:
-        try:
-            if game_state.is_active:
-                async with async_session() as db:
-                    now = datetime.now(timezone.utc)
-                    threshold = now - timedelta(seconds=DECAY_INACTIVITY_THRESHOLD)
-
-                    result = await db.execute(
-                        select(Item)
-                        .where(Item.is_sold_out == False)
-                        .where(
-                            (Item.last_purchase_at == None) |
-                            (Item.last_purchase_at <= threshold)
-                        )
-                    )
-                    idle_items = result.scalars().all()
-
-                    for item in idle_items:
-                        floor_price = item.base_price * MIN_PRICE_FACTOR
-                        new_price = round(item.current_price * (1 - DECAY_PERCENTAGE), 2)
-
-                        if new_price < floor_price:
-                            new_price = round(floor_price, 2)
-
-                        if new_price != item.current_price:
-                            item.current_price = new_price
-
-                            await manager.broadcast({
-                                "type": "ITEM_UPDATE",
-                                "item_id": item.id,
-                                "name": item.name,
-                                "new_price": item.current_price,
-                                "new_stock": item.current_stock,
-                                "is_sold_out": item.is_sold_out,
-                            })
-
-                    if idle_items:
-                        await db.commit()
-
-        except Exception as e:
-            print(f"[price_decay_loop] Error: {e}")
-
-        await asyncio.sleep(DECAY_CHECK_INTERVAL)
+# ── Market Scheduler ────────────────────────────────────
+
+market_scheduler = MarketScheduler(
+    async_session,
+    clock=market_clock,
+    tick_interval=MARKET_TICK_INTERVAL,
+    decay_every=DECAY_CHECK_INTERVAL // MARKET_TICK_INTERVAL,
+    restock_delay=RESTOCK_DELAY,
+    decay_threshold=DECAY_INACTIVITY_THRESHOLD,
+    restock_stock=DEFAULT_STOCK,
+)
+
+
+# ── Drain ────────────────────────────────────────────────
+
+async def drain_server():
+    """Stop admitting buys, let in-flight ones finish, stop the market
+    clock and tell every socket to reconnect later (see drain.py)."""
+    if not drain.begin():
+        return
+    start = time.perf_counter()
+    print(f"🚰 Draining: {drain.in_flight} buy(s) in flight, {manager.connection_count} socket(s)")
+    if not await drain.wait_idle(DRAIN_TIMEOUT):
+        print(f"⚠  Drain timeout: {drain.in_flight} buy(s) still running after {DRAIN_TIMEOUT}s")
+    await market_scheduler.stop()
+    closed = await manager.close_all(drain.restart_message)
+    print(f"🚰 Drained in {(time.perf_counter() - start) * 1000:.0f} ms; "
+          f"sent SERVER_RESTARTING to {closed} socket(s)")
 
 
 # ── App Lifespan ─────────────────────────────────────────
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    await seed_db()
+    # Startup — DDL and seeding only when the DB doesn't match this build
+    phases = StartupPhases()
+    await prewarm_pool(phases)
+    warm = await prepare_database(phases)
+    with phases.phase("catalog"):
+        async with async_session() as db:
+            await catalog.load(db)
+    # Round state from before a restart or crash
+    with phases.phase("event_log"):
+        event_log.recover()
+        event_log.restore()
+    await prewarm_caches(phases)
+    if DIST_DIR.exists():
+        with phases.phase("static"):
+            static_assets.build(DIST_DIR)
+    phases.report(warm)
     print("🚀 Smart Shopping server started")
 
     # Launch background tasks
-    restock_task = asyncio.create_task(restock_loop())
-    decay_task = asyncio.create_task(price_decay_loop())
+    market_scheduler.start()
+    loop_monitor.start()
 
     yield
 
-    # Shutdown
-    restock_task.cancel()
-    decay_task.cancel()
+    # Shutdown — already drained when run via serve.py; under plain uvicorn
+    # the sockets are closed by now and this just stops buys and the clock
+    await drain_server()
+    loop_monitor.stop()
+    if event_log.enabled:
+        event_log.snapshot()
+        await asyncio.to_thread(event_log.close)
     print("🛑 Smart Shopping server stopped")
 
 
@@ -184,6 +155,7 @@ admin = Admin(app, engine, title="Smart Shopping Admin")
 admin.add_view(UserAdmin)
 admin.add_view(ItemAdmin)
 admin.add_view(TransactionAdmin)
+admin.add_view(TransactionArchiveAdmin)
 
 
 # ── Admin Auth ───────────────────────────────────────────
@@ -243,7 +215,16 @@ async def start_game(authorized: bool = Depends(verify_admin)):
     if game_state.is_active:
         raise HTTPException(status_code=400, detail="Game is already running.")
 
+    # Starting market, so the round can be replayed offline (see simulate.py)
+    async with async_session() as db:
+        items = (await db.execute(select(Item).order_by(Item.id))).scalars().all()
+
     game_state.start()
+    game_state.record_action("start_game", items=[item_state(i) for i in items])
+    event_log.append("start_game", round_number=game_state.round_number,
+                     items=[item_state(i) for i in items])
+    contention.reset(game_state.round_number)
+    price_history.reset(items)
     await manager.broadcast({"type": "GAME_STARTED"})
     return {
         "status": "ok",
@@ -282,7 +263,9 @@ async def stop_game(authorized: bool = Depends(verify_admin)):
         for rank, user in enumerate(all_users, start=1)
     ]
 
+    game_state.record_action("stop_game")
     game_state.stop(winners)
+    event_log.append("stop_game", winners=winners)
 
     await manager.broadcast({
         "type": "GAME_OVER",
@@ -308,37 +291,31 @@ async def reset_game(top_n: int = 0, authorized: bool = Depends(verify_admin)):
 
     eliminated_ids = []
 
-    async with async_session() as db:
+    async with write_lock(), async_session() as db:
         if top_n > 0:
-            # Fetch only ACTIVE (non-eliminated) users ordered by balance
-            result = await db.execute(
-                select(User)
+            # Rank active players by balance in one pass: the top N are
+            # reset, the rest eliminated (their balances are left as-is)
+            ranked = (
+                select(
+                    User.id,
+                    func.row_number().over(order_by=User.balance.desc()).label("rank"),
+                )
                 .where(User.is_eliminated == False)
-                .order_by(User.balance.desc())
+                .subquery()
             )
-            all_users = result.scalars().all()
-
-            kept_ids = {u.id for u in all_users[:top_n]}
-            eliminated_ids = [str(u.id) for u in all_users[top_n:]]
-
-            # Mark eliminated users
-            if eliminated_ids:
-                await db.execute(
-                    update(User)
-                    .where(User.id.notin_(kept_ids))
-                    .values(is_eliminated=True)
-                )
-
-            # Reset only kept users
-            await db.execute(
+            kept = ranked.c.rank <= top_n
+            result = await db.execute(
                 update(User)
-                .where(User.id.in_(kept_ids))
+                .where(User.id == ranked.c.id)
                 .values(
-                    balance=DEFAULT_BALANCE,
-                    is_finished=False,
-                    is_eliminated=False,
+                    balance=case((kept, DEFAULT_BALANCE), else_=User.balance),
+                    is_finished=case((kept, False), else_=User.is_finished),
+                    is_eliminated=~kept,
                 )
+                .returning(User.id, User.is_eliminated)
+                .execution_options(synchronize_session=False)
             )
+            eliminated_ids = [str(row.id) for row in result.all() if row.is_eliminated]
         else:
             # No elimination — reset everyone
             await db.execute(
@@ -349,32 +326,62 @@ async def reset_game(top_n: int = 0, authorized: bool = Depends(verify_admin)):
                 )
             )
 
-        # Delete all transactions
+        # Move this round's transactions to the archive in one statement,
+        # then empty the live table without a row-by-row DELETE
+        archive_columns = [c.name for c in TransactionArchive.__table__.columns]
         await db.execute(
-            Transaction.__table__.delete()
+            insert(TransactionArchive).from_select(
+                archive_columns,
+                select(*(Transaction.__table__.c[name] for name in archive_columns)),
+            )
         )
+        if IS_SQLITE:
+            await db.execute(delete(Transaction))
+        else:
+            await db.execute(text(f"TRUNCATE TABLE {Transaction.__tablename__}"))
 
-        # Build a lookup from seed data: name → seed values
-        seed_lookup = {item["name"]: item for item in SEED_ITEMS}
+        # Reset every item's market state (2x base as per seed logic) ...
+        await db.execute(
+            update(Item)
+            .values(
+                current_price=Item.base_price * 2,
+                current_stock=DEFAULT_STOCK,
+                is_sold_out=False,
+                sold_out_timestamp=None,
+                last_purchase_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        # Reset items to seed values
-        result = await db.execute(select(Item))
-        items = result.scalars().all()
-        for item in items:
-            seed = seed_lookup.get(item.name)
-            if seed:
-                item.base_price = seed["base_price"]
-                item.current_price = seed["base_price"] * 2  # 2x base as per seed logic
-            else:
-                item.current_price = item.base_price * 2
-            item.current_stock = DEFAULT_STOCK
-            item.is_sold_out = False
-            item.sold_out_timestamp = None
-            item.last_purchase_at = None
+        # ... then restore seeded base prices via UPDATE ... FROM (VALUES ...)
+        if IS_SQLITE:
+            # SQLite can't alias VALUES columns; one executemany instead
+            await db.execute(
+                update(Item.__table__)
+                .where(Item.name == bindparam("seed_name"))
+                .values(base_price=bindparam("seed_price"), current_price=bindparam("seed_price") * 2),
+                [{"seed_name": item["name"], "seed_price": item["base_price"]} for item in SEED_ITEMS],
+            )
+        else:
+            seed_table = catalog.seed_table()
+            await db.execute(
+                update(Item)
+                .where(Item.name == seed_table.c.name)
+                .values(
+                    base_price=seed_table.c.base_price,
+                    current_price=seed_table.c.base_price * 2,
+                )
+                .execution_options(synchronize_session=False)
+            )
 
         await db.commit()
 
     game_state.reset()
+    price_history.reset()
+    event_log.append("reset_game", eliminated_user_ids=eliminated_ids)
+    stock_shards.clear()
+    # Base prices are back to seed values and nobody owns anything
+    catalog.invalidate()
 
     # Broadcast reset — include eliminated IDs so those clients can auto-logout
     await manager.broadcast({
@@ -398,7 +405,7 @@ async def reset_game(top_n: int = 0, authorized: bool = Depends(verify_admin)):
 @app.patch("/api/admin/update-item/{item_id}", response_model=ItemResponse)
 async def admin_update_item(item_id: int, body: AdminItemUpdate, authorized: bool = Depends(verify_admin)):
     """Admin endpoint to update item price/stock."""
-    async with async_session() as db:
+    async with write_lock(), async_session() as db:
         item = await db.get(Item, item_id)
         if not item:
             raise HTTPException(status_code=404, detail="Item not found")
@@ -415,6 +422,19 @@ async def admin_update_item(item_id: int, body: AdminItemUpdate, authorized: boo
         await db.commit()
         await db.refresh(item)
 
+        if stock_shards.enabled:
+            stock_shards.load(item.id, item.current_stock)
+        if body.base_price is not None:
+            catalog.update_items([item])
+        changes = body.model_dump(exclude_none=True)
+        if game_state.is_active:
+            game_state.record_action("update_item", item_id=item_id, **changes)
+        event_log.append(
+            "update_item", item_id=item.id, price=item.current_price, stock=item.current_stock,
+            is_sold_out=item.is_sold_out, changes=changes,
+        )
+        price_history.record_items([item])
+
         # Broadcast the change
         await manager.broadcast({
             "type": "ITEM_UPDATE",
@@ -428,10 +448,250 @@ async def admin_update_item(item_id: int, body: AdminItemUpdate, authorized: boo
         return ItemResponse.model_validate(item)
 
 
+# ── Admin: Bulk Item Update ─────────────────────────────
+
+ITEM_PATCH_FIELDS = ("current_price", "current_stock", "base_price", "is_sold_out")
+
+
+def bulk_item_values(body: AdminBulkItemUpdate):
+    """(WHERE clause, SET values) applying every patch and rule in one UPDATE.
+
+    Each field becomes one CASE over item ids and rule filters: price
+    multipliers multiply (matching rules compose), set-style rule values
+    take the last matching rule, and explicit per-item patches win over
+    all rules. The expression grows linearly with the request.
+    """
+    cols = Item.__table__.c
+    patches = {patch.id: patch.model_dump(exclude_none=True, exclude={"id"}) for patch in body.items}
+    rules = []
+    for rule in body.rules:
+        cond = true()
+        if rule.category is not None:
+            cond = and_(cond, cols.category == rule.category)
+        if rule.item_ids is not None:
+            cond = and_(cond, cols.id.in_(rule.item_ids))
+        rules.append((rule, cond))
+
+    multipliers = {"current_price": "price_multiplier", "base_price": "base_price_multiplier"}
+    values = {}
+    for field in ITEM_PATCH_FIELDS:
+        expr = cols[field]
+        if field in multipliers:
+            factors = [
+                case((cond, getattr(rule, multipliers[field])), else_=1.0)
+                for rule, cond in rules if getattr(rule, multipliers[field]) is not None
+            ]
+            for factor in factors:
+                expr = expr * factor
+            if factors:
+                # Prices are kept to 2 decimals (round() needs numeric on Postgres)
+                expr = cast(func.round(cast(expr, Numeric), 2), Float)
+        else:
+            whens = [(cond, getattr(rule, field)) for rule, cond in reversed(rules)
+                     if getattr(rule, field, None) is not None]
+            if whens:
+                expr = case(*whens, else_=expr)
+        whens = [(cols.id == item_id, patch[field]) for item_id, patch in patches.items() if field in patch]
+        if whens:
+            expr = case(*whens, else_=expr)
+        if expr is not cols[field]:
+            values[field] = expr
+
+    where = or_(cols.id.in_(list(patches)), *(cond for _, cond in rules))
+    return where, values
+
+
+@app.post("/api/admin/update-items")
+async def admin_update_items(body: AdminBulkItemUpdate, authorized: bool = Depends(verify_admin)):
+    """Apply many item patches and/or rules (e.g. every Luxury item ×0.9)
+    in one statement and broadcast one MARKET_UPDATE."""
+    where, values = bulk_item_values(body)
+    if not values:
+        raise HTTPException(status_code=400, detail="Nothing to update.")
+
+    async with write_lock(), async_session() as db:
+        result = await db.execute(
+            update(Item)
+            .where(where)
+            .values(**values)
+            .returning(Item)
+            .execution_options(synchronize_session=False)
+        )
+        items = sorted(result.scalars().all(), key=lambda i: i.id)
+        await db.commit()
+
+    if stock_shards.enabled:
+        for item in items:
+            stock_shards.load(item.id, item.current_stock)
+    if "base_price" in values:
+        catalog.update_items(items)
+
+    # Resulting values of the touched fields, per item (replayable by simulate.py)
+    changes = [{"item_id": item.id, **{field: getattr(item, field) for field in values}} for item in items]
+    if game_state.is_active:
+        for change in changes:
+            game_state.record_action("update_item", **change)
+    event_log.append("update_items", items=[item_row(item) for item in items], changes=changes)
+    price_history.record_items(items)
+
+    await manager.broadcast({
+        "type": "MARKET_UPDATE",
+        "items": [
+            {
+                "item_id": item.id,
+                "name": item.name,
+                "new_price": item.current_price,
+                "new_stock": item.current_stock,
+                "is_sold_out": item.is_sold_out,
+            }
+            for item in items
+        ],
+    })
+
+    updated_ids = {item.id for item in items}
+    return {
+        "updated": [ItemResponse.model_validate(item) for item in items],
+        "not_found": sorted(item_id for item_id in {p.id for p in body.items} if item_id not in updated_ids),
+    }
+
+
+# ── Admin: Round Export ──────────────────────────────
+
+@app.get("/api/admin/rounds/{round_number}/export")
+async def admin_export_round(round_number: int, authorized: bool = Depends(verify_admin)):
+    """A round's starting market, purchases and admin actions, for offline
+    replay with `python -m app.simulate replay`."""
+    async with async_session() as db:
+        return await export_round(db, round_number)
+
+
+def _export_response(stream, round_number: int, name: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename=round{round_number}-{name}.{fmt}"},
+    )
+
+
+@app.get("/api/admin/rounds/{round_number}/transactions")
+async def admin_export_transactions(round_number: int, format: ExportFormat = "ndjson",
+                                    authorized: bool = Depends(verify_admin)):
+    """Stream every purchase of a round as NDJSON or CSV (see round_export.py)."""
+    return _export_response(export_transactions(round_number, format), round_number, "transactions", format)
+
+
+@app.get("/api/admin/rounds/{round_number}/standings")
+async def admin_export_standings(round_number: int, format: ExportFormat = "ndjson",
+                                 authorized: bool = Depends(verify_admin)):
+    """Stream player standings with the round's purchase totals."""
+    return _export_response(export_standings(round_number, format), round_number, "standings", format)
+
+
+# ── Admin: Stock Shards ─────────────────────────────
+
+@app.get("/api/admin/stock-shards")
+async def admin_stock_shards(authorized: bool = Depends(verify_admin)):
+    """Aggregated stock and price per sharded item, with the per-shard split."""
+    shards = stock_shards.snapshot()
+    async with async_session() as db:
+        result = await db.execute(
+            select(Item.id, Item.name, Item.current_price).where(Item.id.in_(list(shards)))
+        )
+        items = {row.id: row for row in result.all()}
+
+    return {
+        "enabled": stock_shards.enabled,
+        "shard_count": stock_shards.shard_count,
+        "items": [
+            {
+                "item_id": item_id,
+                "name": items[item_id].name if item_id in items else None,
+                "current_price": items[item_id].current_price if item_id in items else None,
+                **info,
+            }
+            for item_id, info in shards.items()
+        ],
+    }
+
+
+# ── Admin: Traces ───────────────────────────────────
+
+@app.get("/api/admin/traces")
+async def admin_traces(limit: int = 100, authorized: bool = Depends(verify_admin)):
+    """Recent sampled /buy traces plus a per-stage time breakdown."""
+    return {
+        "sample_rate": tracer.sample_rate,
+        "buffered": len(tracer.buffer),
+        "summary": tracer.stage_summary(),
+        "traces": tracer.recent(limit),
+    }
+
+
+@app.get("/api/admin/traces.jsonl")
+async def admin_traces_jsonl(authorized: bool = Depends(verify_admin)):
+    """Download the whole trace buffer as JSON lines."""
+    return StreamingResponse(
+        tracer.iter_jsonl(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=traces.jsonl"},
+    )
+
+
+@app.delete("/api/admin/traces")
+async def admin_clear_traces(authorized: bool = Depends(verify_admin)):
+    tracer.clear()
+    return {"status": "ok", "message": "Trace buffer cleared."}
+
+
+# ── Admin: Lock Contention ──────────────────────────
+
+@app.get("/api/admin/contention")
+async def admin_contention(top: int = 20, authorized: bool = Depends(verify_admin)):
+    """Items whose row lock buyers queued on the most this round."""
+    rows = contention.report(top)
+    for row in rows:
+        row["name"] = catalog.names.get(row["item_id"])
+    return {"round": contention.round_number, "items": rows}
+
+
+# ── Admin: Event Loop ───────────────────────────────
+
+@app.get("/api/admin/slow-callbacks")
+async def admin_slow_callbacks(authorized: bool = Depends(verify_admin)):
+    """Recent event-loop stalls with the stack that was blocking the loop."""
+    return {
+        "threshold_ms": loop_monitor.threshold * 1000,
+        "stalls": loop_monitor.recent(),
+    }
+
+
+# ── Metrics ──────────────────────────────────────────
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus text exposition of the app's metrics."""
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 # ── WebSocket Endpoint ───────────────────────────────────
 
+@app.get("/api/health")
+async def health():
+    """Readiness for load balancers: 503 once the server starts draining."""
+    if drain.draining:
+        return JSONResponse({"status": "draining"}, status_code=503)
+    return {"status": "ok"}
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
+    if drain.draining:
+        await websocket.accept()
+        await websocket.send_json(drain.restart_message())
+        await websocket.close(code=1012)
+        return
     await manager.connect(websocket)
     try:
         while True:
@@ -452,25 +712,30 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DIST_DIR = BASE_DIR / "dist"
 
 if DIST_DIR.exists():
-    # Mount assets folder
-    app.mount("/assets", StaticFiles(directory=DIST_DIR / "assets"), name="assets")
+    # Files are looked up in the manifest built at startup (static_assets.py)
+
+    async def serve_spa(request: Request):
+        response = await static_assets.serve(request, "index.html")
+        if response is None:
+            raise HTTPException(status_code=404, detail="index.html not found in dist/")
+        return response
 
     # Serve index.html at root
     @app.get("/")
-    async def serve_spa_index():
-        return FileResponse(DIST_DIR / "index.html")
+    async def serve_spa_index(request: Request):
+        return await serve_spa(request)
 
-    # Catch-all for React routing (must be last)
+    # Catch-all for assets, item images and React routing (must be last)
     @app.get("/{full_path:path}")
-    async def serve_react_app(full_path: str):
+    async def serve_react_app(full_path: str, request: Request):
         # Don't serve HTML for missing API routes
         if full_path.startswith("api/"):
              raise HTTPException(status_code=404, detail="API route not found")
-             
-        target_file = DIST_DIR / full_path
-        if target_file.is_file():
-            return FileResponse(target_file)
-            
-        return FileResponse(DIST_DIR / "index.html")
+
+        response = await static_assets.serve(request, full_path)
+        if response is not None:
+            return response
+
+        return await serve_spa(request)
 else:
     print(f"⚠️ Warning: Frontend dist directory not found at {DIST_DIR}")
@@ -0,0 +1,240 @@
+"""
+metrics.py — Minimal Prometheus-style metrics (counters, gauges, histograms)
+rendered in the text exposition format at GET /metrics.
+
+Kept dependency-free on purpose: everything runs on one event loop, so
+plain dicts and floats are enough — no locks, no client library.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        registry.register(self)
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        """The unlabelled child, for metrics without labels."""
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def render(self, name, labelnames, key):
+        return [f"{name}_total{_format_labels(labelnames, key)} {self.value}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the value at scrape time instead of tracking it."""
+        self.function = function
+
+    def render(self, name, labelnames, key):
+        value = self.function() if self.function else self.value
+        return [f"{name}{_format_labels(labelnames, key)} {value}"]
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def render(self, name, labelnames, key):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            labels = _format_labels(labelnames, key, 'le="%s"' % bound)
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, key, 'le="+Inf"')
+        lines.append(f"{name}_bucket{labels} {self.count}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, key)} {self.sum}")
+        lines.append(f"{name}_count{_format_labels(labelnames, key)} {self.count}")
+        return lines
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+# ── App metrics ──────────────────────────────────────────
+
+BUY_LATENCY = Histogram(
+    "smartshopping_buy_duration_seconds",
+    "Time to handle POST /api/buy, by outcome.",
+    ("outcome",),
+)
+LOCK_WAIT = Histogram(
+    "smartshopping_lock_wait_seconds",
+    "Time spent acquiring SELECT ... FOR UPDATE row locks in /buy.",
+    ("table",),
+)
+DB_POOL_CHECKOUT = Histogram(
+    "smartshopping_db_pool_checkout_seconds",
+    "Time waiting for a pooled DB connection per request.",
+)
+DB_POOL_IN_USE = Gauge(
+    "smartshopping_db_pool_connections_in_use",
+    "DB connections currently checked out of the pool.",
+)
+BROADCAST_DURATION = Histogram(
+    "smartshopping_broadcast_duration_seconds",
+    "Time to fan one message out to every socket.",
+)
+BROADCAST_DROPPED = Counter(
+    "smartshopping_broadcast_frames_dropped",
+    "Frames that failed to send; the socket is dropped.",
+)
+ACTIVE_SOCKETS = Gauge(
+    "smartshopping_active_sockets",
+    "Open WebSocket connections.",
+)
+SWEEP_DURATION = Histogram(
+    "smartshopping_sweep_duration_seconds",
+    "Duration of background market sweeps.",
+    ("sweep",),
+)
+LOOP_LAG = Histogram(
+    "smartshopping_event_loop_lag_seconds",
+    "How late the event loop ran a scheduled wake-up.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+SLOW_CALLBACKS = Counter(
+    "smartshopping_event_loop_stalls",
+    "Times the event loop was blocked longer than LOOP_SLOW_THRESHOLD.",
+)
+STARTUP_PHASE = Gauge(
+    "smartshopping_startup_phase_seconds",
+    "Duration of each phase of the last startup (phase=\"total\" for all of it).",
+    ("phase",),
+)
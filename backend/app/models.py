@@ -13,9 +13,12 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Text,
+    text,
+    TypeDecorator,
+    Uuid,
 )
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -25,19 +28,45 @@ def _utcnow():
     return datetime.now(timezone.utc)
 
 
+class UTCDateTime(TypeDecorator):
+    """DateTime(timezone=True) that always loads as aware UTC.
+    SQLite has no timezone type and hands back naive datetimes."""
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None and dialect.name == "sqlite":
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     username = Column(String(50), unique=True, nullable=False, index=True)
     roll_number = Column(String(50), nullable=True)
     balance = Column(Float, default=100_000.00, nullable=False)
     is_finished = Column(Boolean, default=False, nullable=False)
     is_eliminated = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    created_at = Column(UTCDateTime, default=_utcnow, nullable=False)
 
     transactions = relationship("Transaction", back_populates="user", lazy="selectin")
 
+    __table_args__ = (
+        # Leaderboard: ORDER BY is_finished DESC, balance DESC over active players
+        Index(
+            "ix_users_leaderboard", "is_finished", "balance",
+            postgresql_where=text("NOT is_eliminated"),
+            sqlite_where=text("NOT is_eliminated"),
+        ),
+    )
+
     def __repr__(self):
         return f"<User {self.username} balance={self.balance}>"
 
@@ -53,14 +82,28 @@ class Item(Base):
     # PATCH: Increased stock to 15 to handle 150 users better
     current_stock = Column(Integer, default=15, nullable=False)
     is_sold_out = Column(Boolean, default=False, nullable=False)
-    sold_out_timestamp = Column(DateTime(timezone=True), nullable=True)
+    sold_out_timestamp = Column(UTCDateTime, nullable=True)
     # PATCH: Reduced penalty to 1.1 (10%) to prevent price death spiral
     restock_penalty_multiplier = Column(Float, default=1.1, nullable=False)
     image = Column(String(500), nullable=True)
-    last_purchase_at = Column(DateTime(timezone=True), nullable=True)
+    last_purchase_at = Column(UTCDateTime, nullable=True)
 
     transactions = relationship("Transaction", back_populates="item", lazy="selectin")
 
+    __table_args__ = (
+        # Background sweeps only ever look at one side of is_sold_out
+        Index(
+            "ix_items_restock_due", "sold_out_timestamp",
+            postgresql_where=text("is_sold_out"),
+            sqlite_where=text("is_sold_out"),
+        ),
+        Index(
+            "ix_items_decay_candidates", "last_purchase_at",
+            postgresql_where=text("NOT is_sold_out"),
+            sqlite_where=text("NOT is_sold_out"),
+        ),
+    )
+
     def __repr__(self):
         return f"<Item {self.name} price={self.current_price} stock={self.current_stock}>"
 
@@ -68,14 +111,50 @@ class Item(Base):
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
     item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
     price_at_purchase = Column(Float, nullable=False)
-    timestamp = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    timestamp = Column(UTCDateTime, default=_utcnow, nullable=False)
+    round_number = Column(Integer, default=0, nullable=False)
 
     user = relationship("User", back_populates="transactions")
     item = relationship("Item", back_populates="transactions")
 
+    __table_args__ = (
+        # /buy cooldown lookup (latest purchase per user)
+        Index("ix_transactions_user_id_timestamp", "user_id", "timestamp"),
+        # /buy inventory cap, /me inventory, owned-items bitset
+        Index("ix_transactions_user_id_item_id", "user_id", "item_id"),
+    )
+
     def __repr__(self):
         return f"<Transaction user={self.user_id} item={self.item_id} price={self.price_at_purchase}>"
+
+
+class TransactionArchive(Base):
+    """Transactions of finished rounds. reset_game moves the live table
+    here in bulk, so `transactions` only ever holds the current round."""
+    __tablename__ = "transactions_archive"
+
+    id = Column(Uuid, primary_key=True)
+    user_id = Column(Uuid, ForeignKey("users.id"), nullable=False)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
+    price_at_purchase = Column(Float, nullable=False)
+    timestamp = Column(UTCDateTime, nullable=False)
+    round_number = Column(Integer, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TransactionArchive round={self.round_number} user={self.user_id} item={self.item_id}>"
+
+
+class AppMeta(Base):
+    """Key/value bookkeeping for the app itself (schema and catalog
+    fingerprints used by startup.py to recognise a warm boot)."""
+    __tablename__ = "app_meta"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(Text, nullable=False)
+
+    def __repr__(self):
+        return f"<AppMeta {self.key}={self.value}>"
@@ -0,0 +1,184 @@
+"""
+optimize_images.py — Build step that turns catalog images into small webp variants.
+
+The item images in frontend/public/items are a mix of webp files and JPEGs
+of up to ~1.5 MB. For every image referenced by seed.SEED_ITEMS this
+writes two size-bounded webp variants with content-hash filenames:
+
+    thumb  ≤ 480 px, ≤ 40 KB   → used for Item.image (market cards)
+    full   ≤ 1200 px, ≤ 150 KB
+
+Quality is stepped down until a variant fits its byte budget. Images are
+processed in parallel across a process pool, and inputs whose content hash
+(and the pipeline settings) are unchanged since the last run are skipped.
+The result is recorded in img/manifest.json, which seed.py reads to pick
+Item.image. Run before `npm run build`:
+
+    python -m app.optimize_images            # from backend/
+    python -m app.optimize_images --force    # re-encode everything
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from .seed import SEED_ITEMS
+
+REPO_DIR = Path(__file__).resolve().parent.parent.parent
+SOURCE_DIR = REPO_DIR / "frontend" / "public" / "items"
+OUTPUT_DIR = REPO_DIR / "frontend" / "public" / "img"
+PUBLIC_PREFIX = "/img"
+
+# name → (max side in px, max bytes)
+VARIANTS = {
+    "thumb": (480, 40_000),
+    "full": (1200, 150_000),
+}
+START_QUALITY = 82
+MIN_QUALITY = 45
+QUALITY_STEP = 8
+
+SETTINGS = {
+    "variants": VARIANTS,
+    "start_quality": START_QUALITY,
+    "min_quality": MIN_QUALITY,
+    "quality_step": QUALITY_STEP,
+}
+
+
+def _encode(img: Image.Image, max_side: int, budget: int) -> tuple[bytes, tuple[int, int]]:
+    """webp bytes no larger than `budget` (unless MIN_QUALITY still doesn't fit)."""
+    resized = img.copy()
+    resized.thumbnail((max_side, max_side), Image.LANCZOS)
+    quality = START_QUALITY
+    while True:
+        buf = io.BytesIO()
+        resized.save(buf, "WEBP", quality=quality, method=6)
+        data = buf.getvalue()
+        if len(data) <= budget or quality <= MIN_QUALITY:
+            return data, resized.size
+        quality = max(MIN_QUALITY, quality - QUALITY_STEP)
+
+
+def process_image(source: str, output_dir: str) -> dict:
+    """Encode every variant of one source image (runs in a worker process)."""
+    data = Path(source).read_bytes()
+    entry = {
+        "source_hash": hashlib.sha256(data).hexdigest(),
+        "source_bytes": len(data),
+        "variants": {},
+    }
+    stem = Path(source).stem
+    with Image.open(io.BytesIO(data)) as img:
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        for name, (max_side, budget) in VARIANTS.items():
+            encoded, (width, height) = _encode(img, max_side, budget)
+            digest = hashlib.sha256(encoded).hexdigest()[:10]
+            filename = f"{stem}.{name}.{digest}.webp"
+            target = Path(output_dir) / filename
+            if not target.exists():
+                target.write_bytes(encoded)
+            entry["variants"][name] = {
+                "path": f"{PUBLIC_PREFIX}/{filename}",
+                "width": width,
+                "height": height,
+                "bytes": len(encoded),
+            }
+    return entry
+
+
+def _is_fresh(entry: dict, source: Path, output_dir: Path) -> bool:
+    if not entry:
+        return False
+    if entry["source_hash"] != hashlib.sha256(source.read_bytes()).hexdigest():
+        return False
+    return all(
+        (output_dir / Path(v["path"]).name).exists() for v in entry["variants"].values()
+    )
+
+
+def optimize(source_dir: Path, output_dir: Path, workers: int, force: bool = False) -> dict:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / "manifest.json"
+    previous = {}
+    if manifest_path.exists() and not force:
+        old = json.loads(manifest_path.read_text())
+        if old.get("settings") == json.loads(json.dumps(SETTINGS)):
+            previous = old.get("images", {})
+
+    # Every image the catalog points at, once
+    wanted = sorted({item["image"] for item in SEED_ITEMS if item.get("image")})
+    images, todo, missing = {}, {}, []
+    for public_path in wanted:
+        source = source_dir / Path(public_path).name
+        if not source.is_file():
+            missing.append(public_path)
+        elif _is_fresh(previous.get(public_path), source, output_dir):
+            images[public_path] = previous[public_path]
+        else:
+            todo[public_path] = source
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(process_image, str(source), str(output_dir)): public_path
+            for public_path, source in todo.items()
+        }
+        for future in as_completed(futures):
+            public_path = futures[future]
+            try:
+                images[public_path] = future.result()
+            except Exception as e:
+                print(f"❌ {public_path}: {e}")
+
+    manifest = {"settings": SETTINGS, "images": dict(sorted(images.items()))}
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, manifest_path)
+
+    # Drop outputs no longer referenced by the manifest
+    referenced = {
+        Path(v["path"]).name for entry in images.values() for v in entry["variants"].values()
+    }
+    removed = 0
+    for path in output_dir.glob("*.webp"):
+        if path.name not in referenced:
+            path.unlink()
+            removed += 1
+
+    return {
+        "processed": len(todo), "skipped": len(images) - len(todo),
+        "missing": missing, "removed": removed, "images": images,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", type=Path, default=SOURCE_DIR)
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="ignore the previous manifest")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = optimize(args.source, args.output, args.workers, args.force)
+    images = result["images"].values()
+    before = sum(e["source_bytes"] for e in images)
+    thumbs = sum(e["variants"]["thumb"]["bytes"] for e in images)
+    print(f"🖼️  {result['processed']} processed, {result['skipped']} unchanged, "
+          f"{result['removed']} stale files removed in {time.perf_counter() - started:.1f}s")
+    print(f"📉 Sources {before / 1e6:.1f} MB → thumbnails {thumbs / 1e6:.2f} MB")
+    for public_path in result["missing"]:
+        print(f"⚠  Missing source for {public_path}")
+    print(f"📝 Manifest written to {args.output / 'manifest.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+price_history.py — Per-item OHLC + volume time series, kept in memory.
+
+Every price change is recorded as it happens (buy, restock, decay, admin
+edit) into fixed PRICE_HISTORY_INTERVAL-second buckets of market-clock
+time (clock.py), so they line up with purchase timestamps: open, high, low,
+close and the number of units bought. Each item keeps the last
+PRICE_HISTORY_BUCKETS buckets in a ring buffer, so recording is O(1) and
+serving a chart is O(buckets) — never a scan of `transactions`.
+
+Buckets only exist where something happened; quiet stretches are filled
+in when the series is read (flat at the last close, zero volume). Reads
+can be downsampled server-side to at most `points` buckets per item by
+merging runs of adjacent buckets.
+
+The series cover the current round: start_game clears them and records
+every item's opening price. They are not persisted across restarts.
+"""
+
+import math
+import os
+from collections import deque
+from typing import Optional
+
+from .clock import market_clock
+
+PRICE_HISTORY_INTERVAL = float(os.getenv("PRICE_HISTORY_INTERVAL", "5"))   # seconds per bucket
+PRICE_HISTORY_BUCKETS = int(os.getenv("PRICE_HISTORY_BUCKETS", "720"))      # 1 hour at 5 s
+
+
+class _Series:
+    """Ring buffer of [bucket, open, high, low, close, volume] rows."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, max_buckets: int):
+        self.rows: deque[list] = deque(maxlen=max_buckets)
+
+    def record(self, bucket: int, price: float, volume: int):
+        price = float(price)
+        rows = self.rows
+        if rows and rows[-1][0] == bucket:
+            row = rows[-1]
+            row[2] = max(row[2], price)
+            row[3] = min(row[3], price)
+            row[4] = price
+            row[5] += volume
+        else:
+            # Open at the price the bucket started with, so candles join up
+            open_ = rows[-1][4] if rows else price
+            rows.append([bucket, open_, max(open_, price), min(open_, price), price, volume])
+
+
+class PriceHistory:
+    """OHLC/volume ring buffers keyed by item id."""
+
+    def __init__(self, interval: float, max_buckets: int):
+        self.interval = interval
+        self.max_buckets = max_buckets
+        self.series: dict[int, _Series] = {}
+
+    def _bucket(self, at: Optional[float]) -> int:
+        return int((market_clock.now() if at is None else at) // self.interval)
+
+    def record(self, item_id: int, price: float, volume: int = 0, at: Optional[float] = None):
+        series = self.series.get(item_id)
+        if series is None:
+            series = self.series[item_id] = _Series(self.max_buckets)
+        series.record(self._bucket(at), price, volume)
+
+    def record_items(self, items, at: Optional[float] = None):
+        """Record the current price of each item (restock, decay, admin edits)."""
+        bucket = self._bucket(at)
+        for item in items:
+            series = self.series.get(item.id)
+            if series is None:
+                series = self.series[item.id] = _Series(self.max_buckets)
+            series.record(bucket, item.current_price, 0)
+
+    def reset(self, items=(), at: Optional[float] = None):
+        """Start a new round's history from the items' opening prices."""
+        self.series.clear()
+        self.record_items(items, at)
+
+    def read(self, item_id: int, points: int, window: Optional[float] = None,
+             now: Optional[float] = None) -> Optional[dict]:
+        """Columnar OHLCV for one item, gap-filled up to `now` and merged
+        into at most `points` buckets. None if the item has no history."""
+        series = self.series.get(item_id)
+        if series is None or not series.rows:
+            return None
+        rows = list(series.rows)  # deque indexing is O(n) away from the ends
+        last = self._bucket(now)
+        first = rows[0][0]
+        if window is not None:
+            first = max(first, last - int(window // self.interval) + 1)
+        span = max(1, last - first + 1)
+        step = max(1, math.ceil(span / max(1, points)))
+
+        # t = bucket start (epoch s); every bucket is `interval` seconds wide
+        out = {"interval": step * self.interval, "t": [], "o": [], "h": [], "l": [], "c": [], "v": []}
+        idx = 0
+        close = None
+        # Rows before the window only set the starting close
+        while idx < len(rows) and rows[idx][0] < first:
+            close = rows[idx][4]
+            idx += 1
+        for group in range(first // step, last // step + 1):
+            merged = None
+            while idx < len(rows) and rows[idx][0] // step == group:
+                _, o, h, l, c, v = rows[idx]
+                if merged is None:
+                    merged = [o, h, l, c, v]
+                else:
+                    merged[1] = max(merged[1], h)
+                    merged[2] = min(merged[2], l)
+                    merged[3] = c
+                    merged[4] += v
+                idx += 1
+            if merged is None:
+                if close is None:
+                    continue  # before the item's first price
+                merged = [close, close, close, close, 0]
+            out["t"].append(group * step * self.interval)
+            for key, value in zip("ohlcv", merged):
+                out[key].append(value)
+            close = merged[3]
+        return out
+
+
+# Singleton
+price_history = PriceHistory(PRICE_HISTORY_INTERVAL, PRICE_HISTORY_BUCKETS)
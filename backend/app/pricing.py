@@ -0,0 +1,214 @@
+"""
+pricing.py — Pluggable, vectorized pricing engine.
+
+All market pricing rules live here instead of as literals in the buy path
+and background loops:
+
+- surge:   after a buy, price rises by `surge` (default +2%), except that
+           stock at or below `fire_sale_threshold` crashes it to base_price
+- decay:   idle items lose `decay` (default 2%) per tick, floored at
+           base_price * floor_factor
+- restock: sold-out items come back at price * restock_penalty_multiplier
+
+Prices are rounded to 2 decimals exactly as Python's round() does
+(round_prices), so the standard model reproduces the game's original
+prices to the cent.
+
+Market state is held as NumPy arrays (MarketArrays) so a whole catalog is
+repriced in one vectorized step; the buy path uses the same rules through
+the scalar helper (and the sharded buy path as a SQL expression). The
+model is picked with PRICE_MODEL and tuned with PRICE_MODEL_PARAMS
+(JSON), e.g.
+
+    PRICE_MODEL=elastic PRICE_MODEL_PARAMS='{"scarcity_weight": 0.08}'
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import Float, Numeric, and_, case, cast, func, literal
+
+
+def round_prices(values) -> np.ndarray:
+    """Round to 2 decimals exactly like Python's round().
+
+    np.round scales by 100 first, which can turn a binary value just
+    below a half cent (3299.955 is 3299.95499…) into an exact half and
+    round it up. Values within a hair of a half cent go through round().
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        exact = np.array([round(v, 2) for v in np.atleast_1d(values)[np.atleast_1d(near_half)].tolist()])
+        rounded = np.atleast_1d(rounded).copy()
+        rounded[np.atleast_1d(near_half)] = exact
+        rounded = rounded.reshape(values.shape)
+    return rounded
+
+
+class PriceModel:
+    """The standard rules the game has always used."""
+
+    name = "standard"
+
+    def __init__(self, surge: float = 0.02, fire_sale_threshold: int = 3,
+                 decay: float = 0.02, floor_factor: float = 0.5):
+        self.surge = surge
+        self.fire_sale_threshold = fire_sale_threshold
+        self.decay = decay
+        self.floor_factor = floor_factor
+
+    def surge_factor(self, stock_after: np.ndarray) -> np.ndarray:
+        return np.full(np.shape(stock_after), 1 + self.surge)
+
+    def surge_prices(self, price: np.ndarray, base: np.ndarray, stock_after: np.ndarray) -> np.ndarray:
+        """Price after one unit is bought, given the stock left afterwards."""
+        fire_sale = (stock_after > 0) & (stock_after <= self.fire_sale_threshold)
+        return np.where(fire_sale, base, round_prices(price * self.surge_factor(stock_after)))
+
+    def surge_factor_sql(self, stock_after):
+        return literal(1 + self.surge)
+
+    def surge_price_sql(self, price, base, stock_after):
+        """surge_prices as a SQL expression over columns, for an UPDATE that
+        reprices from the row as it is at write time. Rounded by the
+        database, half away from zero on the decimal value, so on binary
+        half-way values it can be a cent above round_prices()."""
+        surged = cast(func.round(cast(price * self.surge_factor_sql(stock_after), Numeric), 2), Float)
+        fire_sale = and_(stock_after > 0, stock_after <= self.fire_sale_threshold)
+        return case((fire_sale, base), else_=surged)
+
+    def decay_prices(self, price: np.ndarray, base: np.ndarray) -> np.ndarray:
+        """Price after one idle tick."""
+        return np.maximum(round_prices(price * (1 - self.decay)), round_prices(base * self.floor_factor))
+
+    def restock_prices(self, price: np.ndarray, multiplier: np.ndarray) -> np.ndarray:
+        """Price when a sold-out item comes back."""
+        return round_prices(price * multiplier)
+
+    def price_after_buy(self, price: float, base_price: float, stock_after: int) -> float:
+        """Scalar surge for the /buy path."""
+        return float(self.surge_prices(np.asarray(price), np.asarray(base_price), np.asarray(stock_after)))
+
+    def params(self) -> dict:
+        return {"model": self.name, **vars(self)}
+
+
+class ElasticPriceModel(PriceModel):
+    """Surge grows as stock runs out: +surge at full stock, up to
+    +(surge + scarcity_weight) on the last unit."""
+
+    name = "elastic"
+
+    def __init__(self, scarcity_weight: float = 0.05, full_stock: int = 15, **kwargs):
+        super().__init__(**kwargs)
+        self.scarcity_weight = scarcity_weight
+        self.full_stock = full_stock
+
+    def surge_factor(self, stock_after: np.ndarray) -> np.ndarray:
+        scarcity = np.clip(1 - np.asarray(stock_after, dtype=float) / self.full_stock, 0, 1)
+        return 1 + self.surge + self.scarcity_weight * scarcity
+
+    def surge_factor_sql(self, stock_after):
+        scarcity = case(
+            (stock_after <= 0, 1.0),
+            (stock_after >= self.full_stock, 0.0),
+            else_=1 - cast(stock_after, Float) * (1.0 / self.full_stock),
+        )
+        return 1 + self.surge + self.scarcity_weight * scarcity
+
+
+PRICE_MODELS = {model.name: model for model in (PriceModel, ElasticPriceModel)}
+
+
+def load_price_model(name: str = None, params: dict = None) -> PriceModel:
+    name = name or os.getenv("PRICE_MODEL", "standard")
+    if params is None:
+        params = json.loads(os.getenv("PRICE_MODEL_PARAMS", "{}"))
+    if name not in PRICE_MODELS:
+        raise ValueError(f"Unknown PRICE_MODEL {name!r}; choose from {sorted(PRICE_MODELS)}")
+    return PRICE_MODELS[name](**params)
+
+
+def _epoch(dt: datetime) -> float:
+    return dt.timestamp() if dt is not None else np.nan
+
+
+@dataclass
+class MarketStep:
+    """Indices (into MarketArrays) changed by one tick."""
+    restocked: np.ndarray
+    decayed: np.ndarray
+
+
+class MarketArrays:
+    """Catalog market state as parallel NumPy arrays (times in epoch seconds, NaN = never)."""
+
+    def __init__(self, ids, price, base, stock, sold_out, sold_out_at, last_purchase_at, restock_multiplier):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.price = np.asarray(price, dtype=float)
+        self.base = np.asarray(base, dtype=float)
+        self.stock = np.asarray(stock, dtype=np.int64)
+        self.sold_out = np.asarray(sold_out, dtype=bool)
+        self.sold_out_at = np.asarray(sold_out_at, dtype=float)
+        self.last_purchase_at = np.asarray(last_purchase_at, dtype=float)
+        self.restock_multiplier = np.asarray(restock_multiplier, dtype=float)
+
+    @classmethod
+    def from_items(cls, items) -> "MarketArrays":
+        """Build from Item rows (or anything with the same attributes)."""
+        return cls(
+            ids=[i.id for i in items],
+            price=[i.current_price for i in items],
+            base=[i.base_price for i in items],
+            stock=[i.current_stock for i in items],
+            sold_out=[i.is_sold_out for i in items],
+            sold_out_at=[_epoch(i.sold_out_timestamp) for i in items],
+            last_purchase_at=[_epoch(i.last_purchase_at) for i in items],
+            restock_multiplier=[i.restock_penalty_multiplier for i in items],
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def tick(self, model: PriceModel, now: float, restock_delay: float,
+             decay_threshold: float, restock_stock: int, decay: int = 1) -> MarketStep:
+        """Restock due items and decay idle ones `decay` times (True = once,
+        0/False = not at all) across the whole catalog in place. Items
+        restocked this tick are not also decayed."""
+        restock = self.sold_out & (self.sold_out_at <= now - restock_delay)
+        idle = bool(decay) & ~self.sold_out & (
+            np.isnan(self.last_purchase_at) | (self.last_purchase_at <= now - decay_threshold)
+        )
+
+        decayed_price = self.price
+        for _ in range(int(decay)):
+            decayed_price = model.decay_prices(decayed_price, self.base)
+        decayed = idle & (decayed_price != self.price)
+
+        self.price = np.where(restock, model.restock_prices(self.price, self.restock_multiplier), self.price)
+        self.price = np.where(decayed, decayed_price, self.price)
+        self.stock = np.where(restock, restock_stock, self.stock)
+        self.sold_out = self.sold_out & ~restock
+        self.sold_out_at = np.where(restock, np.nan, self.sold_out_at)
+
+        return MarketStep(restocked=np.flatnonzero(restock), decayed=np.flatnonzero(decayed))
+
+    def buy(self, idx: int, model: PriceModel, now: float):
+        """Apply one purchase of the item at index `idx`."""
+        self.stock[idx] -= 1
+        stock_after = self.stock[idx]
+        self.price[idx] = model.surge_prices(self.price[idx], self.base[idx], stock_after)
+        self.last_purchase_at[idx] = now
+        if stock_after == 0:
+            self.sold_out[idx] = True
+            self.sold_out_at[idx] = now
+
+
+# Singleton
+price_model = load_price_model()
@@ -0,0 +1,143 @@
+"""
+round_export.py — Streaming CSV / NDJSON export of a round's purchases
+and standings.
+
+Rows come from a server-side cursor (AsyncConnection.stream) as plain
+Core tuples — no ORM objects, so none of the `selectin` relationships
+the sqladmin views pull in — and are encoded EXPORT_BATCH_SIZE at a
+time. Memory stays constant however large the round is, and the event
+loop gets control back between batches while the next one is fetched.
+
+    transactions  one row per purchase: time, player, item, price
+    standings     one row per player: rank, balance, finished/eliminated,
+                  purchases and amount spent in the round
+
+Balances are live values, so export standings before resetting.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select, union_all, func, literal
+
+from .database import engine
+from .models import Item, User, Transaction, TransactionArchive
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+TRANSACTION_COLUMNS = (
+    "timestamp", "round_number", "transaction_id", "user_id", "username", "roll_number",
+    "item_id", "item_name", "category", "price_at_purchase",
+)
+STANDING_COLUMNS = (
+    "rank", "user_id", "username", "roll_number", "balance", "is_finished",
+    "is_eliminated", "purchases", "distinct_items", "spent",
+)
+
+
+def _round_transactions(round_number: int):
+    """The round's rows from the live table and the archive (a round lives
+    in exactly one of them, but the export doesn't need to know which)."""
+    return union_all(*(
+        select(
+            table.id, table.user_id, table.item_id, table.price_at_purchase,
+            table.timestamp, table.round_number,
+        ).where(table.round_number == round_number)
+        for table in (Transaction, TransactionArchive)
+    )).subquery("round_txns")
+
+
+def transactions_query(round_number: int):
+    txns = _round_transactions(round_number)
+    return (
+        select(
+            txns.c.timestamp, txns.c.round_number, txns.c.id, txns.c.user_id,
+            User.username, User.roll_number, txns.c.item_id, Item.name, Item.category,
+            txns.c.price_at_purchase,
+        )
+        .join(User, User.id == txns.c.user_id)
+        .join(Item, Item.id == txns.c.item_id)
+        .order_by(txns.c.timestamp, txns.c.id)
+    )
+
+
+def standings_query(round_number: int):
+    txns = _round_transactions(round_number)
+    spent = (
+        select(
+            txns.c.user_id,
+            func.count().label("purchases"),
+            func.count(txns.c.item_id.distinct()).label("distinct_items"),
+            func.sum(txns.c.price_at_purchase).label("spent"),
+        )
+        .group_by(txns.c.user_id)
+        .subquery("spent")
+    )
+    # Same order as stop_game's winners (finished first, then balance),
+    # with eliminated players listed last
+    return (
+        select(
+            func.row_number().over(
+                order_by=(User.is_eliminated, User.is_finished.desc(), User.balance.desc())
+            ),
+            User.id, User.username, User.roll_number, User.balance, User.is_finished,
+            User.is_eliminated,
+            func.coalesce(spent.c.purchases, 0),
+            func.coalesce(spent.c.distinct_items, 0),
+            func.coalesce(spent.c.spent, literal(0.0)),
+        )
+        .outerjoin(spent, spent.c.user_id == User.id)
+        .order_by(User.is_eliminated, User.is_finished.desc(), User.balance.desc())
+    )
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    return str(value)  # UUIDs
+
+
+def _encode_ndjson(columns: tuple, rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, map(_plain, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def _encode_csv(columns: tuple, rows) -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerows([_plain(value) for value in row] for row in rows)
+    return buf.getvalue()
+
+
+async def stream_rows(query, columns: tuple, fmt: str) -> AsyncIterator[str]:
+    """Encode the query's rows batch by batch from a server-side cursor."""
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerow(columns)
+        yield buf.getvalue()
+
+    async with engine.connect() as conn:
+        result = await conn.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions(EXPORT_BATCH_SIZE):
+            yield encode(columns, rows)
+
+
+def export_transactions(round_number: int, fmt: str) -> AsyncIterator[str]:
+    return stream_rows(transactions_query(round_number), TRANSACTION_COLUMNS, fmt)
+
+
+def export_standings(round_number: int, fmt: str) -> AsyncIterator[str]:
+    return stream_rows(standings_query(round_number), STANDING_COLUMNS, fmt)
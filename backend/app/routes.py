@@ -2,18 +2,21 @@
 routes.py — API endpoints for Smart Shopping.
 
 The /buy endpoint is the most critical: it uses SELECT FOR UPDATE
-to prevent race conditions on stock and balance.
+to prevent race conditions on stock and balance (on SQLite, which has
+no row locks, purchases go through the single-writer queue instead).
 """
 
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from collections import Counter
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, update, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .database import get_db
+from .database import get_db, write_lock, IS_SQLITE
 from .models import User, Item, Transaction
 from .schemas import (
     RegisterRequest,
@@ -25,10 +28,44 @@ from .schemas import (
 )
 from .websocket_manager import manager
 from .game_state import game_state
+from .stock_shards import stock_shards
+from .catalog import catalog, owned_items
+from .metrics import BUY_LATENCY, LOCK_WAIT
+from .tracing import tracer
+from .contention import contention
+from .pricing import price_model
+from .event_log import event_log
+from .drain import drain
+from .price_history import price_history, PRICE_HISTORY_BUCKETS
+from .clock import market_clock
 
 router = APIRouter(prefix="/api", tags=["game"])
 
 
+class BuyRejected(HTTPException):
+    """A refused /buy, tagged with the outcome label used for metrics."""
+
+    def __init__(self, outcome: str, detail: str, status_code: int = 400, headers: dict = None):
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
+        self.outcome = outcome
+
+
+def leaderboard_message(users) -> dict:
+    """LEADERBOARD_UPDATE payload for users already in leaderboard order."""
+    return {
+        "type": "LEADERBOARD_UPDATE",
+        "leaderboard": [
+            {
+                "username": u.username,
+                "roll_number": u.roll_number,
+                "balance": u.balance,
+                "is_finished": u.is_finished,
+            }
+            for u in users
+        ],
+    }
+
+
 # ── Register ─────────────────────────────────────────────
 
 @router.post("/register", response_model=UserResponse)
@@ -100,6 +137,26 @@ async def list_items(db: AsyncSession = Depends(get_db)):
     return [ItemResponse.model_validate(i) for i in items]
 
 
+# ── Price History ────────────────────────────────────────
+
+@router.get("/items/history")
+async def items_history(
+    ids: Optional[list[int]] = Query(None, description="Item ids (default: every item)"),
+    points: int = Query(120, ge=1, le=PRICE_HISTORY_BUCKETS, description="Max buckets per item"),
+    window: Optional[float] = Query(None, gt=0, description="Only the last N seconds"),
+):
+    """OHLC + volume series per item for this round, downsampled to at most
+    `points` buckets. Served from memory (price_history.py), no DB access."""
+    now = market_clock.now()
+    item_ids = ids if ids is not None else sorted(price_history.series)
+    series = {}
+    for item_id in item_ids:
+        data = price_history.read(item_id, points, window, now)
+        if data is not None:
+            series[item_id] = data
+    return {"items": series}
+
+
 # ── Leaderboard ──────────────────────────────────────────
 
 @router.get("/leaderboard", response_model=list[LeaderboardEntry])
@@ -125,146 +182,266 @@ async def leaderboard(db: AsyncSession = Depends(get_db)):
 
 @router.post("/buy", response_model=BuyResponse)
 async def buy_item(req: BuyRequest, db: AsyncSession = Depends(get_db)):
+    """Time every purchase attempt, labelled by how it ended."""
+    start = time.perf_counter()
+    outcome = "error"
+    with tracer.trace("buy", item_id=req.item_id) as trace, drain.track():
+        try:
+            response = await _execute_buy(req, db)
+            outcome = "success"
+            return response
+        except BuyRejected as e:
+            outcome = e.outcome
+            raise
+        finally:
+            BUY_LATENCY.labels(outcome=outcome).observe(time.perf_counter() - start)
+            if trace:
+                trace.attrs["outcome"] = outcome
+
+
+async def _write_sharded_item(db: AsyncSession, item_id: int, now: datetime):
+    """Take one unit of a sharded item and reprice it in a single UPDATE.
+
+    Price and stock are computed in SQL from the row being written, so
+    concurrent shard buyers each surge from the previous buyer's price.
+    Returns (price paid, refreshed item), or None if the row is out of stock.
     """
-    Atomic purchase with row-level locking to prevent race conditions.
-    """
-    if not game_state.is_active:
-        raise HTTPException(status_code=400, detail="Game is not active. Wait for the admin to start.")
-
-    async with db.begin():
-        # ── Cooldown Check ───────────────────────────
-        # Local import to avoid circular dependency
-        from .main import PURCHASE_COOLDOWN
-
-        # Check last purchase time for this user across ALL items
-        # We can do this check before locking to fail fast, but inside the transaction
-        last_txn_result = await db.execute(
-            select(Transaction.timestamp)
-            .where(Transaction.user_id == req.user_id)
-            .order_by(Transaction.timestamp.desc())
-            .limit(1)
-        )
-        last_txn_time = last_txn_result.scalar_one_or_none()
-
-        if last_txn_time:
-            # Calculate elapsed time
-            now = datetime.now(timezone.utc)
-            elapsed = (now - last_txn_time).total_seconds()
-            
-            if elapsed < PURCHASE_COOLDOWN:
-                remaining = int(PURCHASE_COOLDOWN - elapsed)
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Cooldown active. Please wait {remaining} seconds before your next purchase."
-                )
-
-        # ── Lock the item row ────────────────────────
-        # ── Lock the item row ────────────────────────
-        item_result = await db.execute(
-            select(Item)
-            .where(Item.id == req.item_id)
-            .with_for_update()
-        )
-        item = item_result.scalar_one_or_none()
-
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-
-        if item.is_sold_out:
-            raise HTTPException(status_code=400, detail=f"{item.name} is SOLD OUT. Wait for restock.")
-
-        if item.current_stock <= 0:
-            raise HTTPException(status_code=400, detail=f"{item.name} is out of stock.")
-
-        # ── Lock the user row ────────────────────────
-        user_result = await db.execute(
-            select(User)
-            .where(User.id == req.user_id)
-            .with_for_update()
+    new_stock = Item.current_stock - 1
+    values = dict(
+        current_stock=new_stock,
+        current_price=price_model.surge_price_sql(Item.current_price, Item.base_price, new_stock),
+        last_purchase_at=now,
+        is_sold_out=new_stock <= 0,
+        sold_out_timestamp=case((new_stock <= 0, now), else_=Item.sold_out_timestamp),
+    )
+    if IS_SQLITE:
+        # Buys are serialized by write_lock(), so the row read earlier in
+        # this transaction is current. (SQLite's RETURNING can't see FROM.)
+        item = await db.get(Item, item_id)
+        paid = item.current_price if item else None
+        result = await db.execute(
+            update(Item)
+            .where(Item.id == item_id)
+            .where(Item.current_stock > 0)
+            .values(**values)
+            .returning(Item)
+            .execution_options(populate_existing=True)
         )
-        user = user_result.scalar_one_or_none()
-
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+        item = result.scalar_one_or_none()
+        return (paid, item) if item else None
+
+    # The price paid is the row's price just before this UPDATE: read it
+    # FOR UPDATE in the same statement and return it alongside the new row
+    before = (
+        select(Item.id, Item.current_price.label("paid"))
+        .where(Item.id == item_id)
+        .with_for_update()
+        .subquery("before")
+    )
+    result = await db.execute(
+        update(Item)
+        .where(Item.id == before.c.id)
+        .where(Item.current_stock > 0)
+        .values(**values)
+        .returning(before.c.paid, Item)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    row = result.one_or_none()
+    return (row[0], row[1]) if row else None
 
-        if user.is_finished:
-            raise HTTPException(status_code=400, detail="You have already finished the game!")
 
-        if user.balance < item.current_price:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient balance. Need ₹{item.current_price:.2f}, have ₹{user.balance:.2f}",
-            )
+async def _execute_buy(req: BuyRequest, db: AsyncSession) -> BuyResponse:
+    """
+    Atomic purchase with row-level locking to prevent race conditions.
 
-        # ── Check inventory cap (max 2 of any item) ──
-        inv_result = await db.execute(
-            select(func.count(Transaction.id))
-            .where(Transaction.user_id == req.user_id)
-            .where(Transaction.item_id == req.item_id)
+    With stock sharding enabled, hot items skip the up-front item lock:
+    the buyer takes a unit from an in-memory shard and the item row is
+    written by one guarded UPDATE right before commit. Both paths lock the
+    user row first and the item row second.
+    """
+    if drain.draining:
+        raise BuyRejected(
+            "draining", "Server is restarting. Try again in a moment.",
+            status_code=503, headers={"Retry-After": drain.retry_after()},
         )
-        item_count = inv_result.scalar() or 0
-
-        if item_count >= 2:
-            raise HTTPException(
-                status_code=400,
-                detail=f"You already own {item_count} of {item.name}. Max is 2.",
-            )
-
-        # ── Execute purchase ─────────────────────────
-        purchase_price = item.current_price
-
-        # Deduct balance
-        user.balance -= purchase_price
-
-        # Decrement stock
-        item.current_stock -= 1
+    if not game_state.is_active:
+        raise BuyRejected("game_inactive", "Game is not active. Wait for the admin to start.")
+
+    shard = None
+    try:
+        async with write_lock(), db.begin():
+            # ── Cooldown Check ───────────────────────────
+            # Local import to avoid circular dependency
+            from .main import PURCHASE_COOLDOWN
+
+            # Check last purchase time for this user across ALL items
+            # We can do this check before locking to fail fast, but inside the transaction
+            with tracer.span("cooldown_query"):
+                last_txn_result = await db.execute(
+                    select(Transaction.timestamp)
+                    .where(Transaction.user_id == req.user_id)
+                    .order_by(Transaction.timestamp.desc())
+                    .limit(1)
+                )
+            last_txn_time = last_txn_result.scalar_one_or_none()
+
+            # Market clock, so restock/decay due checks compare like with like
+            now = market_clock.utcnow()
+            if last_txn_time:
+                # Calculate elapsed time
+                elapsed = (now - last_txn_time).total_seconds()
+
+                if elapsed < PURCHASE_COOLDOWN:
+                    remaining = int(PURCHASE_COOLDOWN - elapsed)
+                    raise BuyRejected(
+                        "cooldown",
+                        f"Cooldown active. Please wait {remaining} seconds before your next purchase."
+                    )
+
+            # ── Lock the user row ────────────────────────
+            # Always before the item row, on both paths: a shard flipping
+            # to the locked path mid-buy must not invert the lock order
+            with LOCK_WAIT.labels(table="users").time(), tracer.span("lock_user"):
+                user_result = await db.execute(
+                    select(User)
+                    .where(User.id == req.user_id)
+                    .with_for_update()
+                )
+            user = user_result.scalar_one_or_none()
+
+            if not user:
+                raise BuyRejected("not_found", "User not found", status_code=404)
+
+            if user.is_finished:
+                raise BuyRejected("finished", "You have already finished the game!")
+
+            # ── Sharded stock: admit from an in-memory shard ──
+            if stock_shards.enabled:
+                if not stock_shards.has(req.item_id):
+                    item = await db.get(Item, req.item_id)
+                    if item:
+                        stock_shards.load(item.id, item.current_stock)
+                if stock_shards.is_hot_path(req.item_id):
+                    shard = stock_shards.reserve(req.item_id, req.user_id)
+
+            if shard is not None:
+                # Plain read — the row is written atomically at the end
+                with tracer.span("read_item"):
+                    item = await db.get(Item, req.item_id)
+            else:
+                # ── Lock the item row ────────────────────────
+                with LOCK_WAIT.labels(table="items").time(), tracer.span("lock_item"), \
+                        contention.waiting(req.item_id):
+                    item_result = await db.execute(
+                        select(Item)
+                        .where(Item.id == req.item_id)
+                        .with_for_update()
+                    )
+                item = item_result.scalar_one_or_none()
+
+            if not item:
+                raise BuyRejected("not_found", "Item not found", status_code=404)
+
+            if item.is_sold_out:
+                raise BuyRejected("sold_out", f"{item.name} is SOLD OUT. Wait for restock.")
+
+            if item.current_stock <= 0:
+                raise BuyRejected("sold_out", f"{item.name} is out of stock.")
+
+            if user.balance < item.current_price:
+                raise BuyRejected(
+                    "insufficient_balance",
+                    f"Insufficient balance. Need ₹{item.current_price:.2f}, have ₹{user.balance:.2f}",
+                )
 
-        # ── FIRE SALE LOGIC START ──
-        # If stock is 3 or less, CRASH price to base_price.
-        # Otherwise, hike price by 2%.
-        FIRE_SALE_THRESHOLD = 3
+            # ── Check inventory cap (max 2 of any item) ──
+            with tracer.span("inventory_count"):
+                inv_result = await db.execute(
+                    select(func.count(Transaction.id))
+                    .where(Transaction.user_id == req.user_id)
+                    .where(Transaction.item_id == req.item_id)
+                )
+            item_count = inv_result.scalar() or 0
 
-        if item.current_stock <= FIRE_SALE_THRESHOLD and item.current_stock > 0:
-             item.current_price = item.base_price
-        else:
-             item.current_price = round(item.current_price * 1.02, 2)
-        # ── FIRE SALE LOGIC END ──
+            if item_count >= 2:
+                raise BuyRejected(
+                    "inventory_cap",
+                    f"You already own {item_count} of {item.name}. Max is 2.",
+                )
 
-        # Record last purchase time
-        item.last_purchase_at = datetime.now(timezone.utc)
+            # ── Check if user completed the full set ─────
+            # Owned-items bitset from committed purchases, plus this one
+            with tracer.span("owned_items"):
+                await catalog.ensure(db)
+                owned_bits = await owned_items.get(db, req.user_id) | catalog.bit(req.item_id)
+            is_now_finished = catalog.is_complete(owned_bits)
 
-        # Check if sold out
-        if item.current_stock == 0:
-            item.is_sold_out = True
-            item.sold_out_timestamp = datetime.now(timezone.utc)
+            # ── Execute purchase ─────────────────────────
+            if shard is None:
+                purchase_price = item.current_price
 
-        # Create transaction record
-        txn = Transaction(
-            user_id=req.user_id,
-            item_id=req.item_id,
-            price_at_purchase=purchase_price,
-        )
-        db.add(txn)
+                # Decrement stock
+                item.current_stock -= 1
 
-        # ── Check if user completed the full set ─────
-        # Count distinct items the user now owns (including this purchase)
-        distinct_result = await db.execute(
-            select(func.count(func.distinct(Transaction.item_id)))
-            .where(Transaction.user_id == req.user_id)
-        )
-        # We need to also count the current item if it's new
-        owned_count = distinct_result.scalar() or 0
-        if item_count == 0:
-            # This is a new item for the user (the txn hasn't flushed yet for the count)
-            owned_count += 1
+                # Surge, or fire sale when stock runs low (see pricing.py)
+                item.current_price = price_model.price_after_buy(
+                    item.current_price, item.base_price, item.current_stock
+                )
 
-        # Get total number of items in the game
-        total_items_result = await db.execute(select(func.count(Item.id)))
-        total_items = total_items_result.scalar() or 0
+                # Record last purchase time
+                item.last_purchase_at = now
+
+                # Check if sold out
+                if item.current_stock == 0:
+                    item.is_sold_out = True
+                    item.sold_out_timestamp = now
+            else:
+                # ── Sharded write: one guarded UPDATE that reprices from the
+                # row as it is now (the read above may be stale) ──
+                with tracer.span("item_update"), contention.waiting(req.item_id):
+                    written = await _write_sharded_item(db, req.item_id, now)
+                if written is None:
+                    raise BuyRejected("sold_out", "Item is out of stock.")
+                purchase_price, item = written
+                if user.balance < purchase_price:
+                    raise BuyRejected(
+                        "insufficient_balance",
+                        f"Insufficient balance. Need ₹{purchase_price:.2f}, have ₹{user.balance:.2f}",
+                    )
+
+            # Deduct balance
+            user.balance -= purchase_price
+            if is_now_finished:
+                user.is_finished = True
+
+            # Create transaction record
+            txn = Transaction(
+                user_id=req.user_id,
+                item_id=req.item_id,
+                price_at_purchase=purchase_price,
+                round_number=game_state.round_number,
+                timestamp=now,
+            )
+            db.add(txn)
+
+            # Commit happens as the transaction block exits
+            commit_start = time.perf_counter()
+    except Exception:
+        if shard is not None:
+            stock_shards.release(req.item_id, shard)
+        raise
+    tracer.record("commit", commit_start)
+
+    owned_items.add(req.user_id, req.item_id)
+    price_history.record(item.id, item.current_price, volume=1)
+    event_log.append(
+        "buy", user_id=str(req.user_id), item_id=item.id, paid=purchase_price,
+        price=item.current_price, stock=item.current_stock, is_sold_out=item.is_sold_out,
+    )
 
-        is_now_finished = owned_count >= total_items
-        if is_now_finished:
-            user.is_finished = True
+    # Keep shards in step with purchases that went through the locked path
+    if shard is None and stock_shards.enabled:
+        stock_shards.load(item.id, item.current_stock)
 
     # ── Broadcast updated item state ─────────────────
     await manager.broadcast({
@@ -285,22 +462,12 @@ async def buy_item(req: BuyRequest, db: AsyncSession = Depends(get_db)):
         })
 
     # Broadcast leaderboard update
-    lb_result = await db.execute(
-        select(User).order_by(User.is_finished.desc(), User.balance.desc())
-    )
-    lb_users = lb_result.scalars().all()
-    await manager.broadcast({
-        "type": "LEADERBOARD_UPDATE",
-        "leaderboard": [
-            {
-                "username": u.username,
-                "roll_number": u.roll_number,
-                "balance": u.balance,
-                "is_finished": u.is_finished,
-            }
-            for u in lb_users
-        ],
-    })
+    with tracer.span("leaderboard_query"):
+        lb_result = await db.execute(
+            select(User).order_by(User.is_finished.desc(), User.balance.desc())
+        )
+        lb_users = lb_result.scalars().all()
+    await manager.broadcast(leaderboard_message(lb_users))
 
     return BuyResponse(
         success=True,
@@ -0,0 +1,161 @@
+"""
+scheduler.py — Unified market tick scheduler.
+
+Replaces the separate restock and price-decay loops with one scheduler
+that runs all periodic market work on a fixed tick:
+
+- ticks fire every `tick_interval` seconds on an absolute schedule, so
+  slow ticks don't make the interval drift; if we fall more than a whole
+  tick behind, the missed ticks are skipped rather than run back to back
+- every tick restocks due items; every `decay_every`-th tick also decays
+  idle ones (one MarketArrays step for both)
+- each tick uses one session and commits once, then broadcasts
+
+Time comes from an injectable clock (see clock.py). The app's clock,
+market_clock, is shared with the buy path, which stamps purchases,
+sell-outs and the cooldown check with it, so the restock and decay due
+checks compare times from the same clock.
+
+A tick never runs more often than every MARKET_MIN_TICK_SECONDS of real
+time: at high speeds several ticks are folded into one, which restocks
+once and applies every decay step those ticks were due. Ticks can also
+be driven by hand with `run_tick(now)`.
+"""
+
+import asyncio
+import math
+import os
+from typing import Optional
+
+from sqlalchemy import select
+
+from .database import write_lock
+from .clock import RealClock
+from .models import Item
+from .game_state import game_state
+from .pricing import price_model, MarketArrays, MarketStep
+from .metrics import SWEEP_DURATION
+from .stock_shards import stock_shards
+from .websocket_manager import manager
+from .event_log import event_log, item_row
+from .price_history import price_history
+
+MARKET_MIN_TICK = float(os.getenv("MARKET_MIN_TICK_SECONDS", "0.05"))  # real seconds
+
+
+# ── Scheduler ────────────────────────────────────────────
+
+class MarketScheduler:
+    """Fixed-tick driver for restock and decay while a round is active."""
+
+    def __init__(self, session_factory, clock=None, tick_interval: float = 1.0,
+                 decay_every: int = 5, restock_delay: float = 15,
+                 decay_threshold: float = 10, restock_stock: int = 15):
+        self.session_factory = session_factory
+        self.clock = clock or RealClock()
+        self.tick_interval = tick_interval
+        self.decay_every = max(1, decay_every)
+        self.restock_delay = restock_delay
+        self.decay_threshold = decay_threshold
+        self.restock_stock = restock_stock
+        # Ticks folded into each wakeup so the real period stays >= MARKET_MIN_TICK
+        self.ticks_per_wakeup = max(1, math.ceil(MARKET_MIN_TICK * self.clock.speed / tick_interval))
+        self.ticks = 0
+        self.skipped = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._in_tick = False
+
+    def start(self):
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop after the current tick (a tick in progress is never cut short)."""
+        self._stopping = True
+        if self._task is None:
+            return
+        if not self._in_tick:
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def run(self):
+        period = self.tick_interval * self.ticks_per_wakeup
+        next_tick = self.clock.now()
+        while not self._stopping:
+            next_tick += period
+            await self.clock.sleep(next_tick - self.clock.now())
+
+            now = self.clock.now()
+            behind = now - next_tick
+            if behind > period:
+                missed = int(behind // period)
+                self.skipped += missed * self.ticks_per_wakeup
+                next_tick += missed * period
+                print(f"[scheduler] Running {behind:.2f}s behind, skipped {missed * self.ticks_per_wakeup} tick(s)")
+
+            self._in_tick = True
+            try:
+                await self.run_tick(now, self.ticks_per_wakeup)
+            except Exception as e:
+                print(f"[scheduler] Error: {e}")
+            finally:
+                self._in_tick = False
+
+    async def run_tick(self, now: float, ticks: int = 1) -> Optional[MarketStep]:
+        """Run `ticks` market ticks folded into one at clock time `now`
+        (epoch seconds): one restock check plus every decay step due."""
+        if not game_state.is_active:
+            return None
+
+        decay = (self.ticks + ticks) // self.decay_every - self.ticks // self.decay_every
+        self.ticks += ticks
+
+        with SWEEP_DURATION.labels(sweep="tick").time():
+            async with write_lock(), self.session_factory() as db:
+                query = select(Item).order_by(Item.id)
+                if not decay:
+                    query = query.where(Item.is_sold_out == True)
+                items = (await db.execute(query)).scalars().all()
+
+                market = MarketArrays.from_items(items)
+                step = market.tick(
+                    price_model, now, self.restock_delay, self.decay_threshold,
+                    self.restock_stock, decay=decay,
+                )
+
+                restocked = [items[idx] for idx in step.restocked.tolist()]
+                decayed = [items[idx] for idx in step.decayed.tolist()]
+                for idx, item in zip(step.restocked.tolist(), restocked):
+                    item.current_stock = int(market.stock[idx])
+                    item.is_sold_out = False
+                    item.sold_out_timestamp = None
+                    item.current_price = float(market.price[idx])
+                for idx, item in zip(step.decayed.tolist(), decayed):
+                    item.current_price = float(market.price[idx])
+
+                changed = restocked + decayed
+                if changed:
+                    await db.commit()
+                    event_log.append("tick", items=[item_row(item) for item in changed])
+                    price_history.record_items(changed, now)
+
+            if stock_shards.enabled:
+                for item in restocked:
+                    stock_shards.load(item.id, item.current_stock)
+                # Even out shards drained unevenly by buyer routing
+                stock_shards.rebalance()
+
+            for item in changed:
+                await manager.broadcast({
+                    "type": "ITEM_UPDATE",
+                    "item_id": item.id,
+                    "name": item.name,
+                    "new_price": item.current_price,
+                    "new_stock": item.current_stock,
+                    "is_sold_out": item.is_sold_out,
+                })
+
+        return step
+
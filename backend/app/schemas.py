@@ -30,6 +30,28 @@ class AdminItemUpdate(BaseModel):
     is_sold_out: Optional[bool] = None
 
 
+class AdminItemPatch(AdminItemUpdate):
+    """One item's partial update in a bulk request."""
+    id: int
+
+
+class AdminItemRule(BaseModel):
+    """Update every item matching the filter (no filter = every item).
+    Multipliers compose across rules; explicit patches win over rules."""
+    category: Optional[str] = None
+    item_ids: Optional[list[int]] = None
+    price_multiplier: Optional[float] = Field(None, gt=0)
+    base_price_multiplier: Optional[float] = Field(None, gt=0)
+    current_stock: Optional[int] = Field(None, ge=0)
+    is_sold_out: Optional[bool] = None
+
+
+class AdminBulkItemUpdate(BaseModel):
+    """Many item patches and/or rules, applied in one statement."""
+    items: list[AdminItemPatch] = []
+    rules: list[AdminItemRule] = []
+
+
 # ── Responses ────────────────────────────────────────────
 
 class UserResponse(BaseModel):
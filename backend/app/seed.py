@@ -1,12 +1,28 @@
 """
 seed.py — Populate the items table with initial marketplace goods.
-Run via:  python -m app.seed
+Run via:  python -m app.seed  (applies the migrations first)
+
+Seeding is an idempotent sync: SEED_ITEMS is upserted on every startup,
+so catalog edits here reach an existing database.
 """
 
 import asyncio
-from .database import engine, async_session, Base
+import json
+from pathlib import Path
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import async_session, migrate, IS_SQLITE
 from .models import Item
 
+# Written by `python -m app.optimize_images`; dist/ copy is used in production
+IMAGE_MANIFESTS = [
+    Path(__file__).resolve().parent.parent.parent / "frontend" / "public" / "img" / "manifest.json",
+    Path(__file__).resolve().parent.parent / "dist" / "img" / "manifest.json",
+]
+
 SEED_ITEMS = [
     # ── FOOD & GROCERY (30 Items) - The "Cheap" Volume ─────────────
     # Essential for filling inventory without breaking the bank
@@ -98,40 +114,170 @@ SEED_ITEMS = [
 ]
 
 
+def load_image_manifest() -> dict:
+    for path in IMAGE_MANIFESTS:
+        if path.is_file():
+            return json.loads(path.read_text()).get("images", {})
+    return {}
+
+
+def resolve_image(image: str, manifest: dict) -> str:
+    """Optimized thumbnail for a catalog image, or the original if not built."""
+    entry = manifest.get(image)
+    return entry["variants"]["thumb"]["path"] if entry else image
+
+
+# One statement: upsert the whole catalog from arrays (4 parameters however
+# many items) and diff it against the table as it was before the statement.
+# Market state (current price, stock, ...) of existing items is left alone;
+# rows whose catalog fields are unchanged are not rewritten.
+SYNC_CATALOG_SQL = text("""
+WITH seed (name, category, base_price, image) AS (
+    SELECT * FROM unnest(
+        CAST(:names AS text[]), CAST(:categories AS text[]),
+        CAST(:base_prices AS double precision[]), CAST(:images AS text[])
+    )
+),
+old AS (
+    SELECT name, category, base_price, image FROM items
+),
+upserted AS (
+    INSERT INTO items (name, category, base_price, current_price, current_stock,
+                       is_sold_out, restock_penalty_multiplier, image)
+    SELECT name, category, base_price, base_price * 2, :stock, false, :restock_multiplier, image
+    FROM seed
+    ON CONFLICT (name) DO UPDATE
+        SET category = EXCLUDED.category,
+            base_price = EXCLUDED.base_price,
+            image = EXCLUDED.image
+        WHERE (items.category, items.base_price, items.image)
+              IS DISTINCT FROM (EXCLUDED.category, EXCLUDED.base_price, EXCLUDED.image)
+    RETURNING name, (xmax = 0) AS inserted
+)
+SELECT coalesce(upserted.name, old.name) AS name, upserted.inserted,
+       old.category, old.base_price, old.image, seed.name IS NOT NULL AS in_seed
+FROM upserted
+FULL JOIN old ON old.name = upserted.name
+LEFT JOIN seed ON seed.name = coalesce(upserted.name, old.name)
+""")
+
+CATALOG_FIELDS = ("category", "base_price", "image")
+
+# START GAME LOGIC: new items start at 2x base price with 15 stock
+# and the reduced 1.1x restock penalty
+NEW_ITEM_STOCK = 15
+NEW_ITEM_RESTOCK_MULTIPLIER = 1.1
+
+
+def catalog_rows(items: list[dict] = None) -> list[dict]:
+    """Catalog entries (default SEED_ITEMS) with optimized images resolved."""
+    manifest = load_image_manifest()
+    return [
+        {**data, "image": resolve_image(data.get("image"), manifest)}
+        for data in (SEED_ITEMS if items is None else items)
+    ]
+
+
+async def sync_catalog(session: AsyncSession, items: list[dict] = None) -> dict:
+    """Upsert `items` (default SEED_ITEMS) into the items table in one round
+    trip. Returns the diff: inserted / updated (old → new per field) /
+    unchanged count / names in the DB but not in the catalog (left as-is)."""
+    rows = catalog_rows(items)
+    by_name = {row["name"]: row for row in rows}
+
+    if IS_SQLITE:
+        return await _sync_catalog_sqlite(session, rows)
+
+    result = await session.execute(SYNC_CATALOG_SQL, {
+        "names": [row["name"] for row in rows],
+        "categories": [row["category"] for row in rows],
+        "base_prices": [row["base_price"] for row in rows],
+        "images": [row["image"] for row in rows],
+        "stock": NEW_ITEM_STOCK,
+        "restock_multiplier": NEW_ITEM_RESTOCK_MULTIPLIER,
+    })
+
+    diff = {"inserted": [], "updated": {}, "unchanged": 0, "not_in_catalog": []}
+    for row in result.mappings():
+        if row["inserted"]:
+            diff["inserted"].append(row["name"])
+        elif row["inserted"] is not None:
+            diff["updated"][row["name"]] = _changes(row, by_name[row["name"]])
+        elif row["in_seed"]:
+            diff["unchanged"] += 1
+        else:
+            diff["not_in_catalog"].append(row["name"])
+    return diff
+
+
+async def _sync_catalog_sqlite(session: AsyncSession, rows: list[dict]) -> dict:
+    """Same sync for embedded SQLite (no unnest / xmax): diff against one
+    SELECT, then a single executemany upsert of the new and changed rows.
+    Round trips to a local file cost microseconds, not milliseconds."""
+    existing = {
+        row.name: row
+        for row in (await session.execute(
+            select(Item.name, Item.category, Item.base_price, Item.image)
+        )).all()
+    }
+    diff = {"inserted": [], "updated": {}, "unchanged": 0, "not_in_catalog": []}
+    changed = []
+    for row in rows:
+        old = existing.get(row["name"])
+        if old is None:
+            diff["inserted"].append(row["name"])
+        elif changes := _changes(old._mapping, row):
+            diff["updated"][row["name"]] = changes
+        else:
+            diff["unchanged"] += 1
+            continue
+        changed.append(row)
+    seed_names = {row["name"] for row in rows}
+    diff["not_in_catalog"] = [name for name in existing if name not in seed_names]
+
+    if changed:
+        stmt = sqlite_insert(Item)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Item.name],
+                set_={field: stmt.excluded[field] for field in CATALOG_FIELDS},
+            ),
+            [
+                {
+                    "name": row["name"], "category": row["category"],
+                    "base_price": row["base_price"], "image": row["image"],
+                    "current_price": row["base_price"] * 2,
+                    "current_stock": NEW_ITEM_STOCK, "is_sold_out": False,
+                    "restock_penalty_multiplier": NEW_ITEM_RESTOCK_MULTIPLIER,
+                }
+                for row in changed
+            ],
+        )
+    return diff
+
+
+def _changes(old, new: dict) -> dict:
+    """field → [old, new] for the catalog fields that differ."""
+    return {field: [old[field], new[field]] for field in CATALOG_FIELDS if old[field] != new[field]}
+
+
+def print_diff(diff: dict):
+    print(f"✅ Catalog sync: {len(diff['inserted'])} added, {len(diff['updated'])} updated, "
+          f"{diff['unchanged']} unchanged")
+    for name, changes in diff["updated"].items():
+        print(f"   ~ {name}: " + ", ".join(f"{f} {old!r} → {new!r}" for f, (old, new) in changes.items()))
+    if diff["not_in_catalog"]:
+        print(f"⚠  {len(diff['not_in_catalog'])} item(s) in the DB are not in SEED_ITEMS "
+              f"(left untouched): {', '.join(diff['not_in_catalog'])}")
+
+
 async def seed():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await migrate()
 
     async with async_session() as session:
-        from sqlalchemy import select
-        result = await session.execute(select(Item).limit(1))
-        # Logic to skip if seeded removed/modified to ensure updates if needed,
-        # but for now we'll keep the skip logic or we might want to update existing items?
-        # The user's request usually implies we want these images NOW.
-        # But wait, seed.py is for initial population. The update script will handle existing DB.
-        # So I will keep the skip logic as is, but make sure the Item creation has the image.
-        if result.scalar_one_or_none():
-            print("⚠  Items already seeded. Skipping initial seed.")
-            return
-
-        for data in SEED_ITEMS:
-            item = Item(
-                name=data["name"],
-                category=data["category"],
-                base_price=data["base_price"],
-                # START GAME LOGIC:
-                # Price starts at 2x Base Price
-                current_price=data["base_price"] * 2,
-                # Stock is 15 to allow some buffer
-                current_stock=15,
-                # Restock penalty reduced to 1.1x to prevent crash
-                restock_penalty_multiplier=1.1,
-                image=data.get("image")
-            )
-            session.add(item)
-
+        diff = await sync_catalog(session)
         await session.commit()
-        print(f"✅ Seeded {len(SEED_ITEMS)} items into the database.")
+    print_diff(diff)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+"""
+serve.py — Production entry point: uvicorn with a graceful drain.
+
+Plain `uvicorn app.main:app` closes WebSockets with a bare 1012 before the
+app hears about the shutdown. This runs the same server but drains first
+(main.drain_server): buys stop being admitted and finish, the market
+clock stops, and every socket gets a SERVER_RESTARTING frame with a
+jittered reconnect delay before anything is closed.
+
+    python -m app.serve --host 0.0.0.0 --port 8000
+"""
+
+import argparse
+
+import uvicorn
+
+from .main import app, drain_server
+
+
+class DrainingServer(uvicorn.Server):
+    async def shutdown(self, sockets=None):
+        await drain_server()
+        await super().shutdown(sockets=sockets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--timeout-graceful-shutdown", type=int, default=15,
+                        help="seconds uvicorn waits for connections after the drain")
+    args = parser.parse_args()
+
+    config = uvicorn.Config(
+        app, host=args.host, port=args.port,
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
+    )
+    DrainingServer(config).run()
+
+
+if __name__ == "__main__":
+    main()
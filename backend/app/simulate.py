@@ -0,0 +1,518 @@
+"""
+simulate.py — Offline replay and simulation of game rounds.
+
+Runs the market rules — the /buy checks, pricing.py, and the scheduler's
+restock/decay ticks — in a plain loop on a simulated clock. No server,
+sockets or database are involved, so a whole round replays in well under
+a second and rule changes can be tried before going live.
+
+    # Export a round's transactions and admin actions (needs the database;
+    # also available as GET /api/admin/rounds/{n}/export)
+    python -m app.simulate export --round 3 --output round3.json
+
+    # Replay it as recorded, or under different rules
+    python -m app.simulate replay round3.json --set purchase_cooldown=10
+
+    # Stress-test rules with synthetic players on the seed catalog
+    python -m app.simulate bots --players 2000 --duration 1800 \\
+        --set default_stock=20 --set restock_penalty_multiplier=1.2
+
+Each run prints a summary and writes a JSON report: per-item price
+trajectories, final balances, winners and purchase outcome counts.
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Item, User, Transaction, TransactionArchive
+from .game_state import game_state
+from .pricing import PriceModel, MarketArrays, price_model, load_price_model
+
+STRATEGIES = ("cheapest", "random", "collector")
+
+
+@dataclass
+class Rules:
+    """Game rules the simulation runs under (defaults match main.py)."""
+    purchase_cooldown: float = 30
+    default_stock: int = 15
+    default_balance: float = 100_000.00
+    restock_delay: float = 15
+    tick_interval: float = 1
+    decay_interval: float = 5
+    decay_threshold: float = 10
+    inventory_cap: int = 2
+    restock_penalty_multiplier: Optional[float] = None  # None = each item's own value
+
+    @classmethod
+    def live(cls) -> "Rules":
+        """The rules the server is running with right now."""
+        # Local import to avoid circular dependency
+        from . import main
+        return cls(
+            purchase_cooldown=main.PURCHASE_COOLDOWN,
+            default_stock=main.DEFAULT_STOCK,
+            default_balance=main.DEFAULT_BALANCE,
+            restock_delay=main.RESTOCK_DELAY,
+            tick_interval=main.MARKET_TICK_INTERVAL,
+            decay_interval=main.DECAY_CHECK_INTERVAL,
+            decay_threshold=main.DECAY_INACTIVITY_THRESHOLD,
+        )
+
+    def override(self, assignments: list[str]) -> "Rules":
+        """Apply `name=value` overrides (from --set)."""
+        types = {f.name: f.type for f in fields(self)}
+        for assignment in assignments:
+            name, _, raw = assignment.partition("=")
+            if name not in types:
+                raise SystemExit(f"Unknown rule {name!r}; choose from {sorted(types)}")
+            setattr(self, name, int(raw) if types[name] is int else float(raw))
+        return self
+
+
+def item_state(item) -> dict:
+    """Market state of an Item row, as stored in exports."""
+    return {
+        "id": item.id,
+        "name": item.name,
+        "base_price": item.base_price,
+        "current_price": item.current_price,
+        "current_stock": item.current_stock,
+        "is_sold_out": item.is_sold_out,
+        "restock_penalty_multiplier": item.restock_penalty_multiplier,
+    }
+
+
+# ── Simulation ───────────────────────────────────────────
+
+@dataclass
+class PlayerState:
+    username: str
+    balance: float
+    owned: np.ndarray
+    last_buy_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class Simulation:
+    """One round's market and players, advanced by explicit timestamps."""
+
+    def __init__(self, items: list[dict], rules: Rules, model: PriceModel,
+                 start: float = 0.0, trajectories: bool = True):
+        self.rules = rules
+        self.model = model
+        self.start = start
+        self.now = start
+        self.names = [item["name"] for item in items]
+        self.index = {item["id"]: idx for idx, item in enumerate(items)}
+        self.market = MarketArrays(
+            ids=[item["id"] for item in items],
+            price=[item["current_price"] for item in items],
+            base=[item["base_price"] for item in items],
+            stock=[item["current_stock"] for item in items],
+            sold_out=[item["is_sold_out"] for item in items],
+            sold_out_at=[start if item["is_sold_out"] else np.nan for item in items],
+            last_purchase_at=[np.nan] * len(items),
+            restock_multiplier=[
+                rules.restock_penalty_multiplier or item["restock_penalty_multiplier"] for item in items
+            ],
+        )
+        self.players: dict[str, PlayerState] = {}
+        self.outcomes: Counter = Counter()
+        self.ticks = 0
+        self.next_tick = start + rules.tick_interval
+        self.decay_every = max(1, round(rules.decay_interval / rules.tick_interval))
+        self.trajectories: Optional[dict[int, list]] = None
+        if trajectories:
+            self.trajectories = {item["id"]: [] for item in items}
+            for idx in range(len(items)):
+                self._record(idx, start)
+
+    def _record(self, idx: int, at: float):
+        if self.trajectories is not None:
+            self.trajectories[int(self.market.ids[idx])].append(
+                [round(at - self.start, 3), float(self.market.price[idx]), int(self.market.stock[idx])]
+            )
+
+    def add_player(self, user_id: str, username: str, balance: Optional[float] = None):
+        self.players[user_id] = PlayerState(
+            username=username,
+            balance=self.rules.default_balance if balance is None else balance,
+            owned=np.zeros(len(self.market), dtype=np.int64),
+        )
+
+    def advance_to(self, at: float):
+        """Run every market tick due up to time `at`."""
+        while self.next_tick <= at:
+            self.ticks += 1
+            step = self.market.tick(
+                self.model, self.next_tick, self.rules.restock_delay, self.rules.decay_threshold,
+                self.rules.default_stock, decay=self.ticks % self.decay_every == 0,
+            )
+            for idx in np.concatenate([step.restocked, step.decayed]).tolist():
+                self._record(idx, self.next_tick)
+            self.next_tick += self.rules.tick_interval
+        self.now = max(self.now, at)
+
+    def buy(self, user_id: str, item_id: int, at: float) -> tuple[str, Optional[float]]:
+        """Attempt a purchase with the same checks, in the same order, as /buy.
+        Returns (outcome, price paid)."""
+        self.advance_to(at)
+        player = self.players[user_id]
+        idx = self.index.get(item_id)
+        market = self.market
+
+        if player.last_buy_at is not None and at - player.last_buy_at < self.rules.purchase_cooldown:
+            outcome = "cooldown"
+        elif idx is None:
+            outcome = "not_found"
+        elif market.sold_out[idx] or market.stock[idx] <= 0:
+            outcome = "sold_out"
+        elif player.finished_at is not None:
+            outcome = "finished"
+        elif player.balance < market.price[idx]:
+            outcome = "insufficient_balance"
+        elif player.owned[idx] >= self.rules.inventory_cap:
+            outcome = "inventory_cap"
+        else:
+            outcome = "success"
+
+        self.outcomes[outcome] += 1
+        if outcome != "success":
+            return outcome, None
+
+        price = float(market.price[idx])
+        player.balance -= price
+        player.owned[idx] += 1
+        player.last_buy_at = at
+        if player.owned.all():
+            player.finished_at = at
+        market.buy(idx, self.model, at)
+        self._record(idx, at)
+        return outcome, price
+
+    def update_item(self, item_id: int, at: float, current_price: float = None,
+                    current_stock: int = None, base_price: float = None, is_sold_out: bool = None):
+        """Apply an admin item edit (same fields as PATCH /api/admin/update-item)."""
+        self.advance_to(at)
+        idx = self.index.get(item_id)
+        if idx is None:
+            return
+        if current_price is not None:
+            self.market.price[idx] = current_price
+        if current_stock is not None:
+            self.market.stock[idx] = current_stock
+        if base_price is not None:
+            self.market.base[idx] = base_price
+        if is_sold_out is not None:
+            self.market.sold_out[idx] = is_sold_out
+        self._record(idx, at)
+
+    def candidates(self, user_id: str) -> np.ndarray:
+        """Indices of items the player could buy right now."""
+        player = self.players[user_id]
+        market = self.market
+        affordable = ~market.sold_out & (market.stock > 0) & (market.price <= player.balance)
+        return np.flatnonzero(affordable & (player.owned < self.rules.inventory_cap))
+
+    def report(self) -> dict:
+        standings = sorted(
+            self.players.values(), key=lambda p: (p.finished_at is None, -p.balance)
+        )
+        finish_times = [p.finished_at - self.start for p in standings if p.finished_at is not None]
+        report = {
+            "rules": asdict(self.rules),
+            "price_model": self.model.params(),
+            "duration_s": round(self.now - self.start, 3),
+            "ticks": self.ticks,
+            "players": len(self.players),
+            "outcomes": dict(self.outcomes),
+            "finished_players": len(finish_times),
+            "first_finish_s": round(min(finish_times), 3) if finish_times else None,
+            "winners": [
+                {"rank": rank, "username": p.username, "balance": round(p.balance, 2)}
+                for rank, p in enumerate(standings[:3], start=1)
+            ],
+            "balances": {p.username: round(p.balance, 2) for p in standings},
+            "final_prices": {
+                int(item_id): {
+                    "name": self.names[idx],
+                    "price": float(self.market.price[idx]),
+                    "stock": int(self.market.stock[idx]),
+                    "price_vs_base": round(float(self.market.price[idx] / self.market.base[idx]), 3),
+                }
+                for idx, item_id in enumerate(self.market.ids.tolist())
+            },
+        }
+        if self.trajectories is not None:
+            report["trajectories"] = {str(k): v for k, v in self.trajectories.items()}
+        return report
+
+
+# ── Export ───────────────────────────────────────────────
+
+async def export_round(db: AsyncSession, round_number: int) -> dict:
+    """A round's starting market, players, purchases and admin actions."""
+    rows = []
+    for table in (Transaction, TransactionArchive):
+        result = await db.execute(
+            select(table.user_id, table.item_id, table.price_at_purchase, table.timestamp)
+            .where(table.round_number == round_number)
+        )
+        rows.extend(result.all())
+    rows.sort(key=lambda row: row.timestamp)
+
+    users = (await db.execute(select(User).where(User.is_eliminated == False))).scalars().all()
+    items = (await db.execute(select(Item).order_by(Item.id))).scalars().all()
+    rules = Rules.live()
+
+    # Admin actions are only kept in memory for the current round
+    actions = game_state.actions if round_number == game_state.round_number else []
+    start = next((a for a in actions if a["type"] == "start_game"), None)
+    if start:
+        started_at = start["at"]
+        start_items = start["items"]
+    else:
+        # No snapshot: assume the round started from a freshly reset market
+        started_at = rows[0].timestamp.timestamp() if rows else time.time()
+        start_items = [
+            {**item_state(item), "current_price": item.base_price * 2,
+             "current_stock": rules.default_stock, "is_sold_out": False}
+            for item in items
+        ]
+
+    return {
+        "round": round_number,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "started_at": started_at,
+        "rules": asdict(rules),
+        "price_model": price_model.params(),
+        "items": start_items,
+        "users": [{"id": str(u.id), "username": u.username} for u in users],
+        "transactions": [
+            {
+                "user_id": str(row.user_id),
+                "item_id": row.item_id,
+                "price_at_purchase": row.price_at_purchase,
+                "at": row.timestamp.timestamp(),
+            }
+            for row in rows
+        ],
+        "admin_actions": [a for a in actions if a["type"] != "start_game"],
+    }
+
+
+# ── Replay & bots ────────────────────────────────────────
+
+def _model_from(params: dict) -> PriceModel:
+    params = dict(params)
+    return load_price_model(params.pop("model"), params)
+
+
+def replay(export: dict, rules: Rules, model: PriceModel, trajectories: bool = True) -> dict:
+    """Re-run a recorded round's purchases and admin edits through the rules."""
+    sim = Simulation(export["items"], rules, model, start=export["started_at"], trajectories=trajectories)
+    for user in export["users"]:
+        sim.add_player(user["id"], user["username"])
+
+    # Admin actions before purchases at the same instant
+    events = [(a["at"], 0, a) for a in export["admin_actions"]]
+    events += [(t["at"], 1, t) for t in export["transactions"]]
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    drift = []
+    diverged = Counter()
+    ended_at = None
+    for at, _, event in events:
+        if "item_id" in event and "price_at_purchase" in event:
+            if event["user_id"] not in sim.players:
+                sim.add_player(event["user_id"], event["user_id"])
+            outcome, price = sim.buy(event["user_id"], event["item_id"], at)
+            if price is None:
+                diverged[outcome] += 1
+            else:
+                drift.append(abs(price - event["price_at_purchase"]))
+        elif event["type"] == "update_item":
+            changes = {k: v for k, v in event.items() if k not in ("type", "at", "item_id")}
+            sim.update_item(event["item_id"], at, **changes)
+        elif event["type"] == "stop_game":
+            ended_at = at
+            break
+    sim.advance_to(ended_at or sim.now)
+
+    report = sim.report()
+    report["round"] = export["round"]
+    report["recorded_purchases"] = len(export["transactions"])
+    # Purchases that went through live but are refused under these rules
+    report["rejected_on_replay"] = dict(diverged)
+    report["price_drift"] = {
+        "mean": round(float(np.mean(drift)), 4) if drift else 0.0,
+        "max": round(float(np.max(drift)), 4) if drift else 0.0,
+    }
+    return report
+
+
+def seed_items(rules: Rules) -> list[dict]:
+    """The seed catalog as it looks after a reset (2x base price, full stock)."""
+    # Local import — only needed when no export is given
+    from .seed import SEED_ITEMS
+    return [
+        {
+            "id": idx, "name": item["name"], "base_price": item["base_price"],
+            "current_price": item["base_price"] * 2, "current_stock": rules.default_stock,
+            "is_sold_out": False, "restock_penalty_multiplier": 1.1,
+        }
+        for idx, item in enumerate(SEED_ITEMS, start=1)
+    ]
+
+
+def run_bots(items: list[dict], rules: Rules, model: PriceModel, players: int, duration: float,
+             think_time: float = 5.0, seed: int = 0, trajectories: bool = False) -> dict:
+    """Simulate `players` synthetic players for `duration` seconds of game time."""
+    rng = random.Random(seed)
+    sim = Simulation(items, rules, model, trajectories=trajectories)
+    strategies = {}
+    queue = []
+    for i in range(players):
+        user_id = f"bot_{i}"
+        sim.add_player(user_id, user_id)
+        strategies[user_id] = STRATEGIES[i % len(STRATEGIES)]
+        queue.append((rng.expovariate(1 / think_time), user_id))
+    heapq.heapify(queue)
+
+    while queue:
+        at, user_id = heapq.heappop(queue)
+        if at > duration:
+            break
+        sim.advance_to(at)
+        choices = sim.candidates(user_id)
+        if len(choices) == 0:
+            heapq.heappush(queue, (at + think_time * (0.5 + rng.random()), user_id))
+            continue
+
+        strategy = strategies[user_id]
+        if strategy == "cheapest":
+            idx = choices[np.argmin(sim.market.price[choices])]
+        elif strategy == "collector":
+            missing = choices[sim.players[user_id].owned[choices] == 0]
+            idx = rng.choice(list(missing if len(missing) else choices))
+        else:
+            idx = rng.choice(list(choices))
+
+        outcome, _ = sim.buy(user_id, int(sim.market.ids[idx]), at)
+        player = sim.players[user_id]
+        if player.finished_at is not None:
+            continue
+        wait = think_time * (0.5 + rng.random())
+        if player.last_buy_at is not None:
+            # Players know the cooldown and come back once it is over
+            wait = max(wait, player.last_buy_at + rules.purchase_cooldown - at + 1e-6)
+        heapq.heappush(queue, (at + wait, user_id))
+
+    sim.advance_to(duration)
+    return sim.report()
+
+
+# ── CLI ──────────────────────────────────────────────────
+
+def _summarize(report: dict):
+    print(f"⏱️  {report['duration_s']:.0f}s simulated, {report['ticks']} ticks, {report['players']} players")
+    print(f"🛒 Outcomes: {report['outcomes']}")
+    if "rejected_on_replay" in report:
+        print(f"🔁 {report['recorded_purchases']} recorded purchases; refused on replay: "
+              f"{report['rejected_on_replay'] or 'none'}; price drift mean "
+              f"₹{report['price_drift']['mean']} max ₹{report['price_drift']['max']}")
+    first = f" (first at {report['first_finish_s']:.0f}s)" if report["first_finish_s"] is not None else ""
+    print(f"🏁 {report['finished_players']} finished{first}")
+    for w in report["winners"]:
+        print(f"  #{w['rank']} {w['username']} ₹{w['balance']:,.2f}")
+
+
+async def _export(round_number: int) -> dict:
+    from .database import async_session
+    async with async_session() as db:
+        return await export_round(db, round_number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_p = sub.add_parser("export", help="export a round from the database")
+    export_p.add_argument("--round", type=int, required=True)
+    export_p.add_argument("--output", default=None)
+
+    for name, help_ in (("replay", "replay an exported round"), ("bots", "simulate synthetic players")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("--set", action="append", default=[], metavar="RULE=VALUE",
+                       help=f"override a rule ({', '.join(f.name for f in fields(Rules))})")
+        p.add_argument("--price-model", help="pricing model (default: the recorded/configured one)")
+        p.add_argument("--price-params", help="JSON parameters for the pricing model")
+        p.add_argument("--trajectories", action=argparse.BooleanOptionalAction, default=name == "replay",
+                       help="include per-item price trajectories in the report")
+        p.add_argument("--output", default="simulation_report.json")
+
+    replay_p = sub.choices["replay"]
+    replay_p.add_argument("export_file")
+
+    bots_p = sub.choices["bots"]
+    bots_p.add_argument("--players", type=int, default=1000)
+    bots_p.add_argument("--duration", type=float, default=1800, help="seconds of game time")
+    bots_p.add_argument("--think-time", type=float, default=5.0, help="mean pause between buy attempts")
+    bots_p.add_argument("--seed", type=int, default=0)
+    bots_p.add_argument("--items", help="exported round whose starting catalog to use (default: seed catalog)")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export = asyncio.run(_export(args.round))
+        output = args.output or f"round{args.round}.json"
+        with open(output, "w") as f:
+            json.dump(export, f)
+        print(f"📝 Round {args.round}: {len(export['transactions'])} transactions, "
+              f"{len(export['admin_actions'])} admin actions written to {output}")
+        return
+
+    export = None
+    if args.command == "replay" or args.items:
+        with open(args.export_file if args.command == "replay" else args.items) as f:
+            export = json.load(f)
+
+    rules = Rules(**export["rules"]) if export else Rules()
+    rules.override(args.set)
+    if args.price_model or args.price_params:
+        model = load_price_model(args.price_model, json.loads(args.price_params) if args.price_params else {})
+    elif export:
+        model = _model_from(export["price_model"])
+    else:
+        model = price_model
+
+    started = time.perf_counter()
+    if args.command == "replay":
+        report = replay(export, rules, model, trajectories=args.trajectories)
+    else:
+        items = export["items"] if export else seed_items(rules)
+        report = run_bots(items, rules, model, args.players, args.duration,
+                          think_time=args.think_time, seed=args.seed, trajectories=args.trajectories)
+    report["wall_time_s"] = round(time.perf_counter() - started, 3)
+
+    _summarize(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Report written to {args.output} ({report['wall_time_s']}s wall time)")
+
+
+if __name__ == "__main__":
+    main()
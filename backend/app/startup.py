@@ -0,0 +1,171 @@
+"""
+startup.py — Warm-boot check, cache prewarming and startup phase timings.
+
+Checking the migrations and syncing the seed catalog are idempotent, but
+they cost schema introspection and a catalog upsert on every boot.
+Instead the app_meta table stores two fingerprints:
+
+    schema   hash of the CREATE TABLE / CREATE INDEX DDL of every model
+    catalog  hash of SEED_ITEMS with optimized images resolved
+
+and one SELECT tells whether the database already matches this build.
+If it does (a warm boot, e.g. restarting mid-event) migrations and seeding
+are skipped. Otherwise `alembic upgrade head` runs (database.migrate — the
+only DDL path; create_all is never used), the catalog is synced and the
+new fingerprints are stored. The schema fingerprint is only stored once
+the tables match the models, so a model change without a migration is
+reported on every boot until one is added. STARTUP_MODE=full always takes
+the cold path.
+
+Before the server accepts traffic the DB pool is filled, the catalog
+registry and owned-item bitsets are loaded, and the market and leaderboard
+queries run once so their statements are compiled and their rows cached
+by the database. Each phase is timed, printed, and exported as
+smartshopping_startup_phase_seconds.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from .database import engine, async_session, migrate, Base
+from .models import AppMeta, Item, User
+from .seed import catalog_rows, sync_catalog, print_diff
+from .catalog import owned_items
+from .game_state import game_state
+from .stock_shards import stock_shards
+from .event_log import event_log
+from .metrics import STARTUP_PHASE
+
+STARTUP_MODE = os.getenv("STARTUP_MODE", "auto")  # auto | full
+
+
+def _digest(parts) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def schema_fingerprint() -> str:
+    """Hash of the DDL create_all would emit for this dialect."""
+    dialect = engine.dialect
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            parts.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return _digest(parts)
+
+
+def catalog_fingerprint() -> str:
+    return _digest(json.dumps(row, sort_keys=True) for row in catalog_rows())
+
+
+class StartupPhases:
+    """Wall-clock time of each named startup phase."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = elapsed
+            STARTUP_PHASE.labels(phase=name).set(elapsed)
+
+    def report(self, warm: bool):
+        total = time.perf_counter() - self.started
+        STARTUP_PHASE.labels(phase="total").set(total)
+        detail = " · ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in self.timings.items())
+        print(f"⏱️  Startup ({'warm' if warm else 'cold'}) {total * 1000:.0f} ms — {detail} (ms)")
+
+
+# ── Schema & catalog ─────────────────────────────────────
+
+async def _stored_fingerprints() -> dict:
+    """app_meta contents, or {} if the table doesn't exist yet."""
+    try:
+        async with engine.connect() as conn:
+            rows = await conn.execute(select(AppMeta.key, AppMeta.value))
+            return dict(rows.all())
+    except DBAPIError:
+        return {}
+
+
+async def prepare_database(phases: StartupPhases) -> bool:
+    """Migrate and sync the catalog unless the DB already matches.
+    Returns True for a warm boot."""
+    with phases.phase("schema_check"):
+        expected = {"schema": schema_fingerprint(), "catalog": catalog_fingerprint()}
+        stored = await _stored_fingerprints()
+    if STARTUP_MODE != "full" and all(stored.get(k) == v for k, v in expected.items()):
+        return True
+
+    if stored.get("schema") != expected["schema"] or STARTUP_MODE == "full":
+        with phases.phase("migrate"):
+            drift = await migrate()
+        if drift:
+            # Clear the schema fingerprint so the next boot checks again
+            print(f"⚠  Models differ from the migrated schema — add a migration: {drift}")
+            expected["schema"] = ""
+
+    with phases.phase("catalog_sync"):
+        async with async_session() as db:
+            diff = await sync_catalog(db)
+            for key, value in expected.items():
+                await db.merge(AppMeta(key=key, value=value))
+            await db.commit()
+    print_diff(diff)
+    return False
+
+
+# ── Prewarm ──────────────────────────────────────────────
+
+async def _open_connection():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def prewarm_pool(phases: StartupPhases):
+    """Open pool_size connections up front so the first requests don't pay
+    for connection setup (asyncpg: TCP + auth + type introspection)."""
+    with phases.phase("pool"):
+        await asyncio.gather(*(_open_connection() for _ in range(engine.pool.size())))
+
+
+async def prewarm_caches(phases: StartupPhases):
+    """Run after catalog.load() and event log recovery (bit positions and
+    is_active must be known)."""
+    with phases.phase("market"):
+        async with async_session() as db:
+            items = (await db.execute(select(Item).order_by(Item.id))).scalars().all()
+            # The DB is the authority for stock; the event log may lag it
+            event_log.reconcile(items)
+            if stock_shards.enabled:
+                for item in items:
+                    stock_shards.load(item.id, item.current_stock)
+            if game_state.is_active:
+                # Mid-round restart: every player's owned-item bitset in one query
+                await owned_items.load_all(db)
+
+    with phases.phase("leaderboard"):
+        async with async_session() as db:
+            await db.execute(
+                select(User)
+                .where(User.is_eliminated == False)
+                .order_by(User.is_finished.desc(), User.balance.desc())
+            )
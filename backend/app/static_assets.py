@@ -0,0 +1,254 @@
+"""
+static_assets.py — Precompressed, cache-aware serving of the built SPA.
+
+At startup the dist/ directory (Vite output, including the item images
+copied from frontend/public/items) is walked once into a manifest:
+content type, size, strong ETag and any .br / .gz siblings per file.
+Missing gzip (and brotli, if the `brotli` package is installed) variants
+of text assets are written next to the originals so they are compressed
+once, not per request.
+
+The ETags and variants found are cached in dist/.static-manifest.json,
+keyed by each file's mtime and size, so a restart with an unchanged
+dist/ only stats the files: nothing is read, hashed or compressed. Run
+the compression as a deploy step to keep it out of startup entirely:
+
+    python -m app.static_assets [dist_dir]
+
+Requests are answered from the manifest with no filesystem stat:
+
+- hashed Vite bundles (assets/name-<hash>.js) and optimized item images
+  (img/name.thumb.<hash>.webp) → immutable for a year
+- images and other files → cached for a day, revalidated by strong ETag
+- index.html → always revalidated (new deploys must be picked up)
+- If-None-Match → 304 without touching the file
+- files up to STATIC_CACHE_MAX_FILE are kept in an in-memory LRU bounded
+  at STATIC_CACHE_BYTES, so the game-start rush for images is served from
+  memory; bigger files stream via FileResponse
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response, FileResponse
+
+try:
+    import brotli
+except ImportError:  # optional — gzip only without it
+    brotli = None
+
+STATIC_CACHE_BYTES = int(os.getenv("STATIC_CACHE_BYTES", str(32 * 1024 * 1024)))
+STATIC_CACHE_MAX_FILE = int(os.getenv("STATIC_CACHE_MAX_FILE", str(512 * 1024)))
+
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map", ".xml"}
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller files aren't worth a variant
+MANIFEST_CACHE = ".static-manifest.json"
+
+# Vite output: assets/<name>-<hash>.<ext>; optimize_images: img/<name>.<variant>.<hash>.webp
+HASHED_ASSET = re.compile(r"^(assets/.+-[A-Za-z0-9_-]{8,}|img/.+\.[0-9a-f]{10})\.[A-Za-z0-9]+$")
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_DEFAULT = "public, max-age=86400"
+CACHE_REVALIDATE = "no-cache"
+
+
+@dataclass
+class Asset:
+    path: Path
+    size: int
+    etag: str
+    content_type: str
+    cache_control: str
+    variants: dict[str, Path] = field(default_factory=dict)  # encoding → file
+
+
+class _ByteLRU:
+    """LRU of file contents bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        data = self._data.get(key)
+        if data is not None:
+            self._data.move_to_end(key)
+        return data
+
+    def put(self, key: tuple, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._data[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self):
+        self._data.clear()
+        self.size = 0
+
+
+class StaticAssets:
+    """Manifest of a static directory, served with cache headers and variants."""
+
+    def __init__(self, cache_bytes: int, max_cached_file: int):
+        self.root: Optional[Path] = None
+        self.manifest: dict[str, Asset] = {}
+        self.cache = _ByteLRU(cache_bytes)
+        self.max_cached_file = max_cached_file
+
+    def build(self, root: Path, precompress: bool = True):
+        """Walk `root` once and (re)build the manifest. Files whose mtime and
+        size match the cached manifest are not read again."""
+        self.root = root
+        self.manifest = {}
+        self.cache.clear()
+        cached = self._load_cache(root)
+        fresh = {}
+        written = reused = 0
+        for path in sorted(root.rglob("*")):
+            if not path.is_file() or path.suffix in (".gz", ".br") or path.name == MANIFEST_CACHE:
+                continue
+            rel = path.relative_to(root).as_posix()
+            stat = path.stat()
+            key = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(rel)
+            if entry and entry["stat"] == key and all(
+                path.with_name(path.name + suffix).is_file() for suffix in entry["variants"]
+            ):
+                etag = entry["etag"]
+                reused += 1
+            else:
+                data = path.read_bytes()
+                if precompress:
+                    written += self._precompress(path, data)
+                etag = '"%s"' % hashlib.blake2b(data, digest_size=12).hexdigest()
+            asset = Asset(
+                path=path,
+                size=stat.st_size,
+                etag=etag,
+                content_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+                cache_control=self._cache_control(rel),
+            )
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+                variant = path.with_name(path.name + suffix)
+                if variant.is_file():
+                    asset.variants[encoding] = variant
+            self.manifest[rel] = asset
+            fresh[rel] = {
+                "stat": key, "etag": etag,
+                "variants": [variant.suffix for variant in asset.variants.values()],
+            }
+        if fresh != cached:
+            self._save_cache(root, fresh)
+
+        compressed = sum(1 for a in self.manifest.values() if a.variants)
+        print(f"📦 Static manifest: {len(self.manifest)} files ({reused} unchanged, {compressed} precompressed, "
+              f"{written} variants written) from {root}")
+
+    @staticmethod
+    def _load_cache(root: Path) -> dict:
+        try:
+            return json.loads((root / MANIFEST_CACHE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_cache(root: Path, entries: dict):
+        try:
+            (root / MANIFEST_CACHE).write_text(json.dumps(entries, separators=(",", ":")), encoding="utf-8")
+        except OSError as e:
+            print(f"[static_assets] Could not write {MANIFEST_CACHE}: {e}")
+
+    @staticmethod
+    def _cache_control(rel: str) -> str:
+        if rel == "index.html":
+            return CACHE_REVALIDATE
+        if HASHED_ASSET.match(rel):
+            return CACHE_IMMUTABLE
+        return CACHE_DEFAULT
+
+    @staticmethod
+    def _precompress(path: Path, data: bytes) -> int:
+        """Write missing .gz / .br siblings for a compressible file."""
+        if path.suffix not in COMPRESSIBLE_SUFFIXES or len(data) < MIN_COMPRESS_SIZE:
+            return 0
+        written = 0
+        encoders = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encoders.append((".br", lambda d: brotli.compress(d, quality=11)))
+        for suffix, encode in encoders:
+            variant = path.with_name(path.name + suffix)
+            if variant.exists() and variant.stat().st_mtime >= path.stat().st_mtime:
+                continue
+            compressed = encode(data)
+            if len(compressed) >= len(data):
+                continue
+            try:
+                variant.write_bytes(compressed)
+                written += 1
+            except OSError as e:
+                print(f"[static_assets] Could not write {variant}: {e}")
+        return written
+
+    @staticmethod
+    def _pick_encoding(asset: Asset, accept_encoding: str) -> Optional[str]:
+        accepted = {token.split(";")[0].strip() for token in accept_encoding.split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in asset.variants and encoding in accepted:
+                return encoding
+        return None
+
+    async def serve(self, request: Request, rel_path: str) -> Optional[Response]:
+        """Response for `rel_path`, or None if it is not in the manifest."""
+        asset = self.manifest.get(rel_path)
+        if asset is None:
+            return None
+
+        encoding = self._pick_encoding(asset, request.headers.get("accept-encoding", ""))
+        etag = asset.etag if encoding is None else f'{asset.etag[:-1]}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        path = asset.variants[encoding] if encoding else asset.path
+        if asset.size > self.max_cached_file:
+            return FileResponse(path, media_type=asset.content_type, headers=headers)
+
+        key = (rel_path, encoding)
+        body = self.cache.get(key)
+        if body is None:
+            body = await asyncio.to_thread(path.read_bytes)
+            self.cache.put(key, body)
+        return Response(content=body, media_type=asset.content_type, headers=headers)
+
+
+# Singleton
+static_assets = StaticAssets(STATIC_CACHE_BYTES, STATIC_CACHE_MAX_FILE)
+
+
+if __name__ == "__main__":
+    import sys
+
+    dist = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / "dist"
+    static_assets.build(dist)
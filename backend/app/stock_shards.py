@@ -0,0 +1,92 @@
+"""
+stock_shards.py — Optional in-memory sharding of item stock for hot items.
+
+When STOCK_SHARD_COUNT > 1, each item's stock is split into K slots.
+Buyers are routed to a non-empty slot (starting from a slot derived from
+their user id), so concurrent buys of the same item no longer queue on the
+item row lock for the whole purchase. The DB row stays authoritative: the
+buy path still decrements it with a guarded atomic UPDATE, the shards only
+admit or reject buyers up front.
+
+Once an item's remaining stock drops to the shard count or below, the buy
+path falls back to the strict SELECT ... FOR UPDATE flow.
+"""
+
+import os
+from typing import Optional
+
+STOCK_SHARD_COUNT = int(os.getenv("STOCK_SHARD_COUNT", "0"))
+
+
+class StockShards:
+    """Per-item stock split into K in-memory slots."""
+
+    def __init__(self, shard_count: int):
+        self.shard_count = shard_count
+        self._shards: dict[int, list[int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.shard_count > 1
+
+    def has(self, item_id: int) -> bool:
+        return item_id in self._shards
+
+    def load(self, item_id: int, stock: int):
+        """(Re)distribute `stock` units of an item evenly across the shards."""
+        base, extra = divmod(max(stock, 0), self.shard_count)
+        self._shards[item_id] = [
+            base + (1 if i < extra else 0) for i in range(self.shard_count)
+        ]
+
+    def total(self, item_id: int) -> int:
+        return sum(self._shards.get(item_id, ()))
+
+    def is_hot_path(self, item_id: int) -> bool:
+        """True while there is enough stock left to route buys through shards."""
+        return self.enabled and self.total(item_id) > self.shard_count
+
+    def reserve(self, item_id: int, key) -> Optional[int]:
+        """Take one unit from a non-empty shard. Returns the shard index,
+        or None if every shard of the item is empty."""
+        shards = self._shards.get(item_id)
+        if not shards:
+            return None
+        start = hash(key) % self.shard_count
+        for offset in range(self.shard_count):
+            idx = (start + offset) % self.shard_count
+            if shards[idx] > 0:
+                shards[idx] -= 1
+                return idx
+        return None
+
+    def release(self, item_id: int, shard: int):
+        """Give back a unit taken by reserve() when the purchase fails."""
+        shards = self._shards.get(item_id)
+        if shards is not None:
+            shards[shard] += 1
+
+    def rebalance(self, item_id: Optional[int] = None):
+        """Even out the shards of one item (or all items) without changing totals."""
+        item_ids = [item_id] if item_id is not None else list(self._shards)
+        for iid in item_ids:
+            if iid in self._shards:
+                self.load(iid, self.total(iid))
+
+    def clear(self, item_id: Optional[int] = None):
+        """Drop shard state so it is reloaded from the DB on next use."""
+        if item_id is None:
+            self._shards.clear()
+        else:
+            self._shards.pop(item_id, None)
+
+    def snapshot(self) -> dict:
+        """Aggregated view for the admin UI: total stock plus the per-shard split."""
+        return {
+            item_id: {"stock": sum(shards), "shards": list(shards)}
+            for item_id, shards in sorted(self._shards.items())
+        }
+
+
+# Singleton
+stock_shards = StockShards(STOCK_SHARD_COUNT)
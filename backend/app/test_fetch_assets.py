@@ -0,0 +1,93 @@
+import asyncio
+import json
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+from app.fetch_assets import AssetSource, fetch_assets
+
+IMAGES = {name: bytes([i]) * 50_000 for i, name in enumerate(["alpha", "beta", "gamma"], start=1)}
+FAILURES = {"beta": 2}   # respond 503 this many times first
+CUT_SHORT = {"gamma"}    # first response is truncated to exercise resume
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Product pages at /page/<name>, images at /img/<name>.jpg (with Range support)."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path.startswith("/page/"):
+            name = self.path.rsplit("/", 1)[1]
+            body = f'<html><img src="http://127.0.0.1:{server.server_port}/img/{name}.jpg"></html>'.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        name = Path(self.path).stem
+        server.hits[name] = server.hits.get(name, 0) + 1
+        if server.hits[name] <= FAILURES.get(name, 0):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data = IMAGES[name]
+        start = 0
+        if "Range" in self.headers:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            server.resumed.add(name)
+        if name in CUT_SHORT and server.hits[name] == 1:
+            # Promise the whole file, send half and drop the connection
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data[: len(data) // 2])
+            self.close_connection = True
+            return
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+        self.wfile.write(data[start:])
+
+
+async def run_verification():
+    print("🚀 Starting asset fetcher verification against a stub server...")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.hits, server.resumed = {}, set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    sources = [AssetSource(name, f"{base}/page/{name}") for name in IMAGES]
+    with tempfile.TemporaryDirectory() as tmp:
+        save_dir, report_path = Path(tmp) / "items", Path(tmp) / "report.json"
+
+        report = await fetch_assets(sources, save_dir, report_path, concurrency=3, backoff=0.01)
+        assert report["summary"] == {"downloaded": 3}, report["summary"]
+        for name, data in IMAGES.items():
+            assert (save_dir / f"{name}.jpg").read_bytes() == data, f"{name} corrupted"
+        beta = next(r for r in report["results"] if r["name"] == "beta")
+        assert beta["attempts"] == 4, beta  # page + 2 failures + success
+        assert "gamma" in server.resumed, "truncated download was not resumed with Range"
+        print("✅ Retries, backoff and Range resume work")
+
+        report = await fetch_assets(sources, save_dir, report_path, concurrency=3)
+        assert report["summary"] == {"present": 3}, report["summary"]
+        print("✅ Second run skips assets already present")
+
+        report = await fetch_assets(sources, save_dir, report_path, refresh=True)
+        assert report["summary"] == {"unchanged": 3}, report["summary"]
+        assert json.loads(report_path.read_text())["results"][0]["sha256"]
+        print("✅ Refresh detects identical content by hash")
+
+    server.shutdown()
+    print("🎉 All checks passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_verification())
@@ -0,0 +1,96 @@
+import numpy as np
+
+from app.pricing import PriceModel, ElasticPriceModel, MarketArrays, round_prices
+
+NAN = float("nan")
+
+
+def market(**overrides) -> MarketArrays:
+    """One item at price 200 (base 100, stock 15), idle and in stock."""
+    fields = dict(
+        ids=[1], price=[200.0], base=[100.0], stock=[15], sold_out=[False],
+        sold_out_at=[NAN], last_purchase_at=[NAN], restock_multiplier=[1.1],
+    )
+    fields.update(overrides)
+    return MarketArrays(**fields)
+
+
+def run_verification():
+    print("🚀 Starting pricing model verification...")
+    model = PriceModel()
+
+    # ── Surge and fire sale (/buy) ───────────────────────
+    assert model.price_after_buy(200.0, 100.0, 14) == 204.0
+    assert model.price_after_buy(3235.25, 100.0, 10) == round(3235.25 * 1.02, 2) == 3299.95
+    assert isinstance(model.price_after_buy(200.0, 100.0, 14), float)
+    print("✅ Buy surges +2%, rounded like round()")
+
+    assert model.price_after_buy(500.0, 100.0, 4) == 510.0    # above the threshold: surge
+    assert model.price_after_buy(500.0, 100.0, 3) == 100.0    # at the threshold: fire sale
+    assert model.price_after_buy(500.0, 100.0, 1) == 100.0
+    assert model.price_after_buy(500.0, 100.0, 0) == 510.0    # last unit: surge, then sold out
+    print("✅ Fire sale crashes to base price at 1..3 units left")
+
+    elastic = ElasticPriceModel(scarcity_weight=0.05, full_stock=15)
+    assert elastic.price_after_buy(100.0, 50.0, 15) == 102.0
+    assert elastic.price_after_buy(100.0, 50.0, 0) == 107.0
+    assert 102.0 < elastic.price_after_buy(100.0, 50.0, 8) < 107.0
+    print("✅ Elastic surge grows as stock runs out")
+
+    # ── Rounding matches Python's round() ────────────────
+    rng = np.random.default_rng(7)
+    values = np.concatenate([rng.uniform(1, 5000, 50_000) * 1.02, np.arange(1, 500_000, 7) / 1000])
+    expected = np.array([round(v, 2) for v in values.tolist()])
+    assert (round_prices(values) == expected).all()
+    assert round_prices(3299.955) == 3299.95 and np.round(3299.955, 2) == 3299.96
+    print("✅ round_prices agrees with round() on binary half-way values")
+
+    # ── Restock (market tick) ────────────────────────────
+    now = 1_000.0
+    m = market(stock=[0], sold_out=[True], sold_out_at=[now - 15])
+    step = m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+    assert step.restocked.tolist() == [0] and step.decayed.tolist() == []
+    assert m.stock[0] == 15 and not m.sold_out[0] and np.isnan(m.sold_out_at[0])
+    assert m.price[0] == 220.0  # restock multiplier 1.1, not decayed in the same tick
+    print("✅ Sold-out items restock at price × restock multiplier")
+
+    m = market(stock=[0], sold_out=[True], sold_out_at=[now - 14])
+    step = m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+    assert step.restocked.size == 0 and m.sold_out[0] and m.price[0] == 200.0
+    print("✅ Restock waits for the delay")
+
+    # ── Decay (market tick) ──────────────────────────────
+    m = market(last_purchase_at=[now - 10])
+    step = m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+    assert step.decayed.tolist() == [0] and m.price[0] == 196.0
+    m = market(last_purchase_at=[now - 9])
+    step = m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+    assert step.decayed.size == 0 and m.price[0] == 200.0
+    m = market(last_purchase_at=[now - 10])
+    m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15, decay=False)
+    assert m.price[0] == 200.0
+    print("✅ Idle items decay 2% per decay tick; recent buys and non-decay ticks don't")
+
+    m = market(price=[50.5])
+    m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+    assert m.price[0] == 50.0  # 49.49 floored at base × 0.5
+    step = m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15)
+    assert m.price[0] == 50.0 and step.decayed.size == 0  # at the floor: no change to report
+    print("✅ Decay stops at base_price × 0.5")
+
+    m = market()
+    m.tick(model, now, restock_delay=15, decay_threshold=10, restock_stock=15, decay=3)
+    assert m.price[0] == round(round(round(200 * 0.98, 2) * 0.98, 2) * 0.98, 2)
+    print("✅ Folded ticks apply each decay step")
+
+    # ── Buy on the arrays (simulations) ──────────────────
+    m = market(stock=[1])
+    m.buy(0, model, now)
+    assert m.stock[0] == 0 and m.sold_out[0] and m.sold_out_at[0] == now and m.price[0] == 204.0
+    print("✅ Buying the last unit sells the item out")
+
+    print("🎉 All checks passed")
+
+
+if __name__ == "__main__":
+    run_verification()
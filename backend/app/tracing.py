@@ -0,0 +1,145 @@
+"""
+tracing.py — Lightweight in-process tracing for the purchase pipeline.
+
+A sampled fraction of /buy requests records a trace: a list of timed
+spans (cooldown query, item lock, user lock, commit, broadcasts, ...).
+Finished traces go into a bounded ring buffer that admins can read or
+download as JSON lines, and a per-stage summary shows where the time goes
+under load — no external tracing service needed.
+
+The current trace travels in a ContextVar, so code called from a traced
+request (e.g. ConnectionManager.broadcast) adds spans without any
+plumbing; outside a trace, span() is a no-op.
+"""
+
+import json
+import os
+import random
+import time
+import uuid
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+
+
+class Trace:
+    """One sampled request: named spans with offsets relative to its start."""
+
+    def __init__(self, name: str, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.spans: list[dict] = []
+
+    def add_span(self, name: str, start: float, end: float):
+        self.spans.append({
+            "name": name,
+            "offset_ms": round((start - self.start) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+        })
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "attrs": self.attrs,
+            "spans": self.spans,
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+class Tracer:
+    """Samples traces and keeps the most recent ones in a ring buffer."""
+
+    def __init__(self, sample_rate: float, buffer_size: int):
+        self.sample_rate = sample_rate
+        self.buffer: deque[Trace] = deque(maxlen=buffer_size)
+
+    @contextmanager
+    def trace(self, name: str, **attrs):
+        """Start a (sampled) trace. Yields the Trace, or None if not sampled."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            yield None
+            return
+        trace = Trace(name, **attrs)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            trace.duration_ms = round((time.perf_counter() - trace.start) * 1000, 3)
+            self.buffer.append(trace)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a stage of the current trace (no-op when not tracing)."""
+        trace = _current_trace.get()
+        if trace is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace.add_span(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float):
+        """Close a span started at perf_counter() value `start` — for stages
+        that can't be wrapped in a with block (e.g. a commit on block exit)."""
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(name, start, time.perf_counter())
+
+    def recent(self, limit: int = 100) -> list[dict]:
+        return [t.to_dict() for t in list(self.buffer)[-limit:]]
+
+    def iter_jsonl(self):
+        for trace in list(self.buffer):
+            yield json.dumps(trace.to_dict()) + "\n"
+
+    def dump_jsonl(self, path: str) -> int:
+        """Write the buffered traces to `path` as JSON lines. Returns the count."""
+        lines = list(self.iter_jsonl())
+        with open(path, "w") as f:
+            f.writelines(lines)
+        return len(lines)
+
+    def stage_summary(self) -> list[dict]:
+        """Per-span totals across the buffer, biggest share of time first."""
+        durations: dict[str, list[float]] = defaultdict(list)
+        for trace in list(self.buffer):
+            for span in trace.spans:
+                durations[span["name"]].append(span["duration_ms"])
+        total = sum(sum(v) for v in durations.values()) or 1.0
+        summary = []
+        for name, values in durations.items():
+            values.sort()
+            summary.append({
+                "stage": name,
+                "count": len(values),
+                "mean_ms": round(sum(values) / len(values), 3),
+                "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max_ms": values[-1],
+                "share": round(sum(values) / total, 4),
+            })
+        summary.sort(key=lambda s: s["share"], reverse=True)
+        return summary
+
+    def clear(self):
+        self.buffer.clear()
+
+
+# Singleton
+tracer = Tracer(TRACE_SAMPLE_RATE, TRACE_BUFFER_SIZE)
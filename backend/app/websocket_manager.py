@@ -5,8 +5,13 @@ price/stock updates to all connected clients in real time.
 
 import json
 import asyncio
+from typing import Callable
+
 from fastapi import WebSocket
 
+from .metrics import BROADCAST_DURATION, BROADCAST_DROPPED, ACTIVE_SOCKETS
+from .tracing import tracer
+
 
 class ConnectionManager:
     """Handles WebSocket lifecycle and fan-out broadcasting."""
@@ -28,16 +33,31 @@ class ConnectionManager:
     async def broadcast(self, message: dict):
         """Send a JSON payload to every connected client.
         Silently removes dead connections."""
-        payload = json.dumps(message)
+        with BROADCAST_DURATION.time(), tracer.span(f"broadcast.{message.get('type', 'message')}"):
+            payload = json.dumps(message)
+            async with self._lock:
+                stale = []
+                for ws in self.active_connections:
+                    try:
+                        await ws.send_text(payload)
+                    except Exception:
+                        stale.append(ws)
+                for ws in stale:
+                    self.active_connections.remove(ws)
+                BROADCAST_DROPPED.inc(len(stale))
+
+    async def close_all(self, make_message: Callable[[], dict], code: int = 1012) -> int:
+        """Send each client its own final frame, then close the socket.
+        Returns how many were closed."""
         async with self._lock:
-            stale = []
-            for ws in self.active_connections:
-                try:
-                    await ws.send_text(payload)
-                except Exception:
-                    stale.append(ws)
-            for ws in stale:
-                self.active_connections.remove(ws)
+            connections, self.active_connections = self.active_connections, []
+        for ws in connections:
+            try:
+                await ws.send_text(json.dumps(make_message()))
+                await ws.close(code=code)
+            except Exception:
+                pass
+        return len(connections)
 
     async def send_personal(self, websocket: WebSocket, message: dict):
         """Send a JSON payload to a single client."""
@@ -53,3 +73,4 @@ class ConnectionManager:
 
 # Singleton instance used across the app
 manager = ConnectionManager()
+ACTIVE_SOCKETS.set_function(lambda: manager.connection_count)
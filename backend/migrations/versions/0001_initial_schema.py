@@ -0,0 +1,63 @@
+"""Initial schema: users, items, transactions
+
+Matches what Base.metadata.create_all produced before migrations were
+introduced. Databases created that way should be stamped at this
+revision (alembic stamp 0001) and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Uuid, primary_key=True),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("roll_number", sa.String(50), nullable=True),
+        sa.Column("balance", sa.Float, nullable=False),
+        sa.Column("is_finished", sa.Boolean, nullable=False),
+        sa.Column("is_eliminated", sa.Boolean, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "items",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("category", sa.String(50), nullable=False),
+        sa.Column("base_price", sa.Float, nullable=False),
+        sa.Column("current_price", sa.Float, nullable=False),
+        sa.Column("current_stock", sa.Integer, nullable=False),
+        sa.Column("is_sold_out", sa.Boolean, nullable=False),
+        sa.Column("sold_out_timestamp", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("restock_penalty_multiplier", sa.Float, nullable=False),
+        sa.Column("image", sa.String(500), nullable=True),
+        sa.Column("last_purchase_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.Uuid, primary_key=True),
+        sa.Column("user_id", sa.Uuid, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("item_id", sa.Integer, sa.ForeignKey("items.id"), nullable=False),
+        sa.Column("price_at_purchase", sa.Float, nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("transactions")
+    op.drop_table("items")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,43 @@
+"""Per-round transactions: round_number column and transactions_archive
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "transactions",
+        sa.Column("round_number", sa.Integer, nullable=False, server_default="0"),
+    )
+    # Batch mode so SQLite (no ALTER COLUMN) rebuilds the table instead
+    with op.batch_alter_table("transactions") as batch:
+        batch.alter_column("round_number", server_default=None)
+
+    op.create_table(
+        "transactions_archive",
+        sa.Column("id", sa.Uuid, primary_key=True),
+        sa.Column("user_id", sa.Uuid, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("item_id", sa.Integer, sa.ForeignKey("items.id"), nullable=False),
+        sa.Column("price_at_purchase", sa.Float, nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("round_number", sa.Integer, nullable=False),
+    )
+    op.create_index(
+        "ix_transactions_archive_round_number", "transactions_archive", ["round_number"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_transactions_archive_round_number", table_name="transactions_archive")
+    op.drop_table("transactions_archive")
+    op.drop_column("transactions", "round_number")
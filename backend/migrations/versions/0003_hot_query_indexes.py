@@ -0,0 +1,53 @@
+"""Indexes for the hot queries
+
+- transactions(user_id, timestamp): /buy cooldown lookup (newest first)
+- transactions(user_id, item_id): /buy inventory cap, /me inventory,
+  owned-items bitset
+- items(sold_out_timestamp) WHERE is_sold_out: restock sweep
+- items(last_purchase_at) WHERE NOT is_sold_out: price decay sweep
+- users(is_finished, balance) WHERE NOT is_eliminated: leaderboard
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_transactions_user_id_timestamp", "transactions", ["user_id", "timestamp"]
+    )
+    op.create_index(
+        "ix_transactions_user_id_item_id", "transactions", ["user_id", "item_id"]
+    )
+    op.create_index(
+        "ix_items_restock_due", "items", ["sold_out_timestamp"],
+        postgresql_where=sa.text("is_sold_out"),
+        sqlite_where=sa.text("is_sold_out"),
+    )
+    op.create_index(
+        "ix_items_decay_candidates", "items", ["last_purchase_at"],
+        postgresql_where=sa.text("NOT is_sold_out"),
+        sqlite_where=sa.text("NOT is_sold_out"),
+    )
+    op.create_index(
+        "ix_users_leaderboard", "users", ["is_finished", "balance"],
+        postgresql_where=sa.text("NOT is_eliminated"),
+        sqlite_where=sa.text("NOT is_eliminated"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_leaderboard", table_name="users")
+    op.drop_index("ix_items_decay_candidates", table_name="items")
+    op.drop_index("ix_items_restock_due", table_name="items")
+    op.drop_index("ix_transactions_user_id_item_id", table_name="transactions")
+    op.drop_index("ix_transactions_user_id_timestamp", table_name="transactions")
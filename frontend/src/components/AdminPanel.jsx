@@ -16,6 +16,8 @@ export default function AdminPanel() {
     const [sortDir, setSortDir] = useState('asc');
     const [topN, setTopN] = useState(0);
     const [resetResult, setResetResult] = useState(null);
+    const [repriceCategory, setRepriceCategory] = useState('');
+    const [repricePercent, setRepricePercent] = useState(-10);
 
     const [isAuthenticated, setIsAuthenticated] = useState(false);
     const [password, setPassword] = useState('');
@@ -97,6 +99,30 @@ export default function AdminPanel() {
         } catch { /* ignore */ }
     }
 
+    // ── Bulk Reprice ─────────────────────────────────────
+    // One request, one statement, one MARKET_UPDATE broadcast
+    async function repriceCategoryItems() {
+        setLoading('reprice');
+        setError('');
+        try {
+            const rule = { price_multiplier: 1 + repricePercent / 100 };
+            if (repriceCategory) rule.category = repriceCategory;
+            const res = await fetch('/api/admin/update-items', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ rules: [rule] }),
+            });
+            if (!res.ok) {
+                const data = await res.json();
+                setError(data.detail || 'Reprice failed');
+            }
+            await fetchItems();
+        } catch {
+            setError('Network error during reprice');
+        }
+        setLoading('');
+    }
+
     // ── Sort ─────────────────────────────────────────────
     function toggleSort(field) {
         if (sortField === field) {
@@ -378,10 +404,44 @@ export default function AdminPanel() {
 
                 {/* ═══ ITEMS TABLE ═══ */}
                 <section>
-                    <h2 className="text-xs font-bold tracking-[0.2em] uppercase text-[#64748b] !mb-4 flex items-center gap-2">
-                        <Package className="w-4 h-4" />
-                        Market Items ({items.length})
-                    </h2>
+                    <div className="flex items-center justify-between !mb-4 gap-4 flex-wrap">
+                        <h2 className="text-xs font-bold tracking-[0.2em] uppercase text-[#64748b] flex items-center gap-2">
+                            <Package className="w-4 h-4" />
+                            Market Items ({items.length})
+                        </h2>
+
+                        {/* Bulk reprice: every item (or one category) by a percentage */}
+                        <div className="flex items-center gap-2">
+                            <select
+                                value={repriceCategory}
+                                onChange={e => setRepriceCategory(e.target.value)}
+                                className="bg-[#0f1629] border border-[#475569] rounded-lg !px-2.5 !py-2 text-white text-xs"
+                            >
+                                <option value="">All categories</option>
+                                {[...new Set(items.map(i => i.category))].map(category => (
+                                    <option key={category} value={category}>{category}</option>
+                                ))}
+                            </select>
+                            <input
+                                type="number"
+                                step={1}
+                                min={-90}
+                                value={repricePercent}
+                                onChange={e => setRepricePercent(Math.max(-90, parseFloat(e.target.value) || 0))}
+                                className="w-16 bg-[#0f1629] border border-[#475569] rounded-lg !px-2 !py-2 text-white text-xs font-mono text-center"
+                            />
+                            <span className="text-[10px] text-[#64748b]">%</span>
+                            <button
+                                onClick={repriceCategoryItems}
+                                disabled={!!loading || repricePercent === 0}
+                                className="flex items-center gap-1 text-[10px] !px-3 !py-2 rounded-lg border border-[#475569] text-[#94a3b8] font-bold uppercase
+                                    hover:border-[#f59e0b] hover:text-[#f59e0b] transition-colors disabled:opacity-30 disabled:cursor-not-allowed"
+                            >
+                                <DollarSign className="w-3 h-3" />
+                                {loading === 'reprice' ? 'Repricing...' : 'Reprice'}
+                            </button>
+                        </div>
+                    </div>
 
                     <div className="bg-[#1e293b] border border-[#334155] rounded-xl overflow-hidden">
                         <div className="overflow-x-auto">
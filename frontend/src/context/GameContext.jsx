@@ -41,6 +41,25 @@ function gameReducer(state, action) {
             };
         }
 
+        case 'UPDATE_ITEMS': {
+            // Coalesced MARKET_UPDATE: many items in one state change
+            const updates = new Map(action.payload.map(u => [u.item_id, u]));
+            return {
+                ...state,
+                items: state.items.map(item => {
+                    const update = updates.get(item.id);
+                    if (!update) return item;
+                    return {
+                        ...item,
+                        current_price: update.new_price,
+                        current_stock: update.new_stock,
+                        is_sold_out: update.is_sold_out,
+                        _priceDirection: update.new_price > item.current_price ? 'up' : update.new_price < item.current_price ? 'down' : null,
+                    };
+                }),
+            };
+        }
+
         case 'CLEAR_PRICE_DIRECTION': {
             return {
                 ...state,
@@ -149,6 +168,7 @@ export function GameProvider({ children }) {
     const setUser = useCallback((user) => dispatch({ type: 'SET_USER', payload: user }), []);
     const setItems = useCallback((items) => dispatch({ type: 'SET_ITEMS', payload: items }), []);
     const updateItem = useCallback((data) => dispatch({ type: 'UPDATE_ITEM', payload: data }), []);
+    const updateItems = useCallback((updates) => dispatch({ type: 'UPDATE_ITEMS', payload: updates }), []);
     const clearPriceDirection = useCallback((id) => dispatch({ type: 'CLEAR_PRICE_DIRECTION', payload: id }), []);
     const setLeaderboard = useCallback((lb) => dispatch({ type: 'SET_LEADERBOARD', payload: lb }), []);
     const setGamePhase = useCallback((phase) => dispatch({ type: 'SET_GAME_PHASE', payload: phase }), []);
@@ -166,7 +186,7 @@ export function GameProvider({ children }) {
             value={{
                 ...state,
                 sessionLoading,
-                setUser, setItems, updateItem, clearPriceDirection,
+                setUser, setItems, updateItem, updateItems, clearPriceDirection,
                 setLeaderboard, setGamePhase, setGameActive,
                 setGameResult, clearGameResult,
                 updateBalance, setWsConnected, addToast, removeToast, logout,
@@ -4,7 +4,7 @@ import { useGame } from '../context/GameContext';
 export function useGameSocket() {
   const {
     user, gamePhase,
-    updateItem, setLeaderboard, setGamePhase,
+    updateItem, updateItems, setLeaderboard, setGamePhase,
     setWsConnected, addToast,
     setGameActive, setGameResult, updateBalance, setItems,
     logout,
@@ -13,6 +13,25 @@ export function useGameSocket() {
   const wsRef = useRef(null);
   const reconnectTimer = useRef(null);
   const reconnectDelay = useRef(1000);
+  // Set by SERVER_RESTARTING: reconnect after the server's jittered hint
+  // instead of the backoff, then resync state the socket may have missed
+  const restartHint = useRef(null);
+
+  // Refresh items and the user's balance from the server
+  const refreshState = useCallback(() => {
+    fetch('/api/items')
+      .then(r => r.ok ? r.json() : [])
+      .then(data => setItems(data))
+      .catch(() => {});
+    if (user?.id) {
+      fetch(`/api/me/${user.id}`)
+        .then(r => r.ok ? r.json() : null)
+        .then(data => {
+          if (data) updateBalance(data.balance);
+        })
+        .catch(() => {});
+    }
+  }, [setItems, updateBalance, user?.id]);
 
   const connect = useCallback(() => {
     if (wsRef.current?.readyState === WebSocket.OPEN) return;
@@ -26,10 +45,18 @@ export function useGameSocket() {
     ws.onopen = () => {
       setWsConnected(true);
       reconnectDelay.current = 1000;
+      if (restartHint.current !== null) {
+        restartHint.current = null;
+        refreshState();
+      }
     };
 
     ws.onclose = () => {
       setWsConnected(false);
+      if (restartHint.current !== null) {
+        reconnectTimer.current = setTimeout(connect, restartHint.current);
+        return;
+      }
       // Auto-reconnect with exponential backoff (max 10s)
       reconnectTimer.current = setTimeout(() => {
         reconnectDelay.current = Math.min(reconnectDelay.current * 1.5, 10000);
@@ -71,27 +98,26 @@ export function useGameSocket() {
                 break;
               }
             }
-            // Refresh items from server
-            fetch('/api/items')
-              .then(r => r.ok ? r.json() : [])
-              .then(data => setItems(data))
-              .catch(() => {});
-            // Refresh user data
-            if (user?.id) {
-              fetch(`/api/me/${user.id}`)
-                .then(r => r.ok ? r.json() : null)
-                .then(data => {
-                  if (data) updateBalance(data.balance);
-                })
-                .catch(() => {});
-            }
+            refreshState();
             addToast({ type: 'info', message: '🔄 Game reset! Fresh round incoming.' });
             break;
 
+          case 'SERVER_RESTARTING':
+            // Server is draining; it closes the socket right after this frame
+            restartHint.current = msg.reconnect_after_ms ?? reconnectDelay.current;
+            addToast({ type: 'info', message: '🔁 Server restarting — reconnecting in a moment...' });
+            break;
+
           case 'ITEM_UPDATE':
             updateItem(msg);
             break;
 
+          case 'MARKET_UPDATE':
+            if (msg.items?.length) {
+              updateItems(msg.items);
+            }
+            break;
+
           case 'LEADERBOARD_UPDATE':
             if (msg.leaderboard) {
               setLeaderboard(msg.leaderboard);
@@ -112,7 +138,7 @@ export function useGameSocket() {
         // Ignore malformed messages
       }
     };
-  }, [setWsConnected, setGamePhase, setGameActive, setGameResult, updateItem, setLeaderboard, addToast, updateBalance, setItems, logout, user?.id]);
+  }, [setWsConnected, setGamePhase, setGameActive, setGameResult, updateItem, updateItems, setLeaderboard, addToast, logout, user?.id, refreshState]);
 
   // Connect once user is logged in
   useEffect(() => {